@@ -22,6 +22,8 @@ from pywriter.config.configuration import Configuration
 from pywriter.ui.set_icon_tk import *
 from nvprogresslib.nvprogress_globals import *
 from nvprogresslib.progress_viewer import ProgressViewer
+from nvprogresslib.word_counter import WordCounter
+from nvprogresslib.timing_log import timingLog
 
 SETTINGS = dict(
     window_geometry='510x440',
@@ -30,8 +32,14 @@ SETTINGS = dict(
     wordcount_delta_width=100,
     totalcount_width=100,
     totalcount_delta_width=100,
+    period='day',
+    word_target=0,
+)
+OPTIONS = dict(
+    show_timings=False,
+    log_timings=False,
+    auto_refresh=True,
 )
-OPTIONS = {}
 
 
 class Plugin:
@@ -40,6 +48,7 @@ class Plugin:
     Public methods:
         disable_menu() -- disable menu entries when no project is open.
         enable_menu() -- enable menu entries when a project is open.    
+        get_timings(count) -- Return the most recent timings of the instrumented operations.
     """
     VERSION = '@release'
     NOVELYST_API = '4.18'
@@ -54,31 +63,35 @@ class Plugin:
         """Enable menu entries when a project is open."""
         self._ui.toolsMenu.entryconfig(APPLICATION, state='normal')
 
+    def get_timings(self, count=None):
+        """Return a list of the most recent timings, the latest last.
+        
+        Optional arguments:
+            count: int -- maximum number of entries. Default: all recorded entries.
+            
+        The entries are (name, start time as time.time() value, duration in seconds) tuples.
+        """
+        return timingLog.get_timings(count)
+
     def install(self, ui):
         """Add a submenu to the 'Tools' menu.
         
         Positional arguments:
             ui -- reference to the NovelystTk instance of the application.
+            
+        Keep the application's startup fast: 
+        Load the configuration not before the viewer is started.
         """
-        self._ui = ui
-        self._progress_viewer = None
+        with timingLog.span('Plugin.install'):
+            self._ui = ui
+            self._progress_viewer = None
+            self.wordCounter = WordCounter()
+            self.configuration = None
+            self.kwargs = None
 
-        #--- Load configuration.
-        try:
-            homeDir = str(Path.home()).replace('\\', '/')
-            configDir = f'{homeDir}/.pywriter/novelyst/config'
-        except:
-            configDir = '.'
-        self.iniFile = f'{configDir}/progress.ini'
-        self.configuration = Configuration(SETTINGS, OPTIONS)
-        self.configuration.read(self.iniFile)
-        self.kwargs = {}
-        self.kwargs.update(self.configuration.settings)
-        self.kwargs.update(self.configuration.options)
-
-        # Create an entry in the Tools menu.
-        self._ui.toolsMenu.add_command(label=APPLICATION, command=self._start_viewer)
-        self._ui.toolsMenu.entryconfig(APPLICATION, state='disabled')
+            # Create an entry in the Tools menu.
+            self._ui.toolsMenu.add_command(label=APPLICATION, command=self._start_viewer)
+            self._ui.toolsMenu.entryconfig(APPLICATION, state='disabled')
 
     def on_close(self):
         """Close the window."""
@@ -90,15 +103,41 @@ class Plugin:
             if self._progress_viewer.isOpen:
                 self._progress_viewer.on_quit()
 
-        #--- Save configuration
+        #--- Save configuration, if loaded.
+        if self.configuration is None:
+            return
+
         for keyword in self.kwargs:
             if keyword in self.configuration.options:
                 self.configuration.options[keyword] = self.kwargs[keyword]
             elif keyword in self.configuration.settings:
                 self.configuration.settings[keyword] = self.kwargs[keyword]
-        self.configuration.write(self.iniFile)
+        with timingLog.span('Configuration.write'):
+            self.configuration.write(self.iniFile)
+        timingLog.disable_file_log()
+
+    def _load_configuration(self):
+        """Read the configuration file, if not done yet."""
+        if self.configuration is not None:
+            return
+
+        try:
+            homeDir = str(Path.home()).replace('\\', '/')
+            configDir = f'{homeDir}/.pywriter/novelyst/config'
+        except:
+            configDir = '.'
+        self.iniFile = f'{configDir}/progress.ini'
+        with timingLog.span('Configuration.read'):
+            self.configuration = Configuration(SETTINGS, OPTIONS)
+            self.configuration.read(self.iniFile)
+        self.kwargs = {}
+        self.kwargs.update(self.configuration.settings)
+        self.kwargs.update(self.configuration.options)
+        if self.kwargs['log_timings']:
+            timingLog.enable_file_log(f'{configDir}/progress_timing.log')
 
     def _start_viewer(self):
+        self._load_configuration()
         if self._progress_viewer:
             if self._progress_viewer.isOpen:
                 self._progress_viewer.lift()
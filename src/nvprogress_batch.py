@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""Export word count log reports for many novelyst projects in parallel.
+
+Usage:
+nvprogress_batch.py [-h] [-w WORKERS] [-p PERIOD] [-f FORMAT] [--from DATE] [--to DATE] [-o OUTPUT] sourcepath [sourcepath ...]
+
+positional arguments:
+  sourcepath  project file, directory, or glob pattern, e.g. "projects/**/*.yw7"
+
+optional arguments:
+  -w WORKERS  number of worker processes (default: number of CPUs)
+  -p PERIOD   aggregation period: day, week, month, or year (default: day)
+  -f FORMAT   report format: html, csv, jsonl, or ods (default: html)
+  --from DATE first day to export, ISO formatted (default: the log's first day)
+  --to DATE   last day to export, ISO formatted (default: the log's last day)
+  -o OUTPUT   output directory (default: the project directories)
+              Projects with the same file name are written to subdirectories named after their directories.
+
+The reports are written without a GUI, one process per project file.
+Each project's timing or failure is reported on stdout.
+The exit code is 1 if any export failed.
+
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
+from novelystlib.model.work_file import WorkFile
+from nvprogresslib.csv_wc_log import CsvWcLog
+from nvprogresslib.html_wc_log import HtmlWcLog
+from nvprogresslib.jsonl_wc_log import JsonlWcLog
+from nvprogresslib.ods_wc_log import OdsWcLog
+from nvprogresslib.wc_log_series import WcLogSeries
+from nvprogresslib.wc_log_series import PERIODS
+from nvprogresslib.wc_log_series import iso_to_ordinal
+from nvprogresslib.wc_log_series import ordinal_to_iso
+
+PROJECT_EXTENSION = '.yw7'
+EXPORT_CLASSES = dict(
+    html=HtmlWcLog,
+    csv=CsvWcLog,
+    jsonl=JsonlWcLog,
+    ods=OdsWcLog,
+    )
+
+
+def find_projects(sourcePaths):
+    """Return a sorted list of project file paths.
+
+    Positional arguments:
+        sourcePaths -- list of project file paths, directory paths, or glob patterns.
+
+    Directories are searched for project files, without recursion.
+    """
+    prjFiles = set()
+    for sourcePath in sourcePaths:
+        for path in glob.glob(sourcePath, recursive=True) or [sourcePath]:
+            if os.path.isdir(path):
+                prjFiles.update(glob.glob(os.path.join(path, f'*{PROJECT_EXTENSION}')))
+            elif path.endswith(PROJECT_EXTENSION):
+                prjFiles.add(path)
+    return sorted(prjFiles)
+
+
+def get_output_dirs(prjFiles, outputDir):
+    """Return a dictionary of the report directories by project file path.
+
+    Positional arguments:
+        prjFiles -- list of project file paths.
+        outputDir: str -- common output directory, or None for the project directories.
+
+    Projects with the same file name get a subdirectory of the output directory,
+    named after the project directory and a short hash of its path,
+    so that their reports do not overwrite each other.
+    """
+    if outputDir is None:
+        return {prjFilePath: None for prjFilePath in prjFiles}
+
+    fileNames = {}
+    for prjFilePath in prjFiles:
+        fileName = os.path.normcase(os.path.basename(prjFilePath))
+        fileNames[fileName] = fileNames.get(fileName, 0) + 1
+    outputDirs = {}
+    for prjFilePath in prjFiles:
+        if fileNames[os.path.normcase(os.path.basename(prjFilePath))] > 1:
+            prjDir = os.path.dirname(os.path.abspath(prjFilePath))
+            digest = zlib.crc32(prjDir.encode('utf-8'))
+            outputDirs[prjFilePath] = os.path.join(outputDir, f'{os.path.basename(prjDir)}_{digest:08x}')
+        else:
+            outputDirs[prjFilePath] = outputDir
+    return outputDirs
+
+
+def export_report(prjFilePath, period='day', outputDir=None, exportFormat='html', startDate=None, endDate=None):
+    """Export a project's word count log. Return the report's path.
+
+    Positional arguments:
+        prjFilePath: str -- path to the project file.
+
+    Optional arguments:
+        period: str -- aggregation period, one of PERIODS.
+        outputDir: str -- directory of the report, created if missing. Default: the project directory.
+        exportFormat: str -- key of EXPORT_CLASSES.
+        startDate: str -- ISO date of the first day to export. Default: no limit.
+        endDate: str -- ISO date of the last day to export. Default: no limit.
+
+    Raise the "Error" exception in case of error.
+    """
+    prjFile = WorkFile(prjFilePath)
+    prjFile.novel = Novel()
+    prjFile.read()
+    root, extension = os.path.splitext(prjFilePath)
+    if outputDir is not None:
+        os.makedirs(outputDir, exist_ok=True)
+        root = os.path.join(outputDir, os.path.basename(root))
+    exportClass = EXPORT_CLASSES[exportFormat]
+    report = exportClass(f'{root}{exportClass.SUFFIX}{exportClass.EXTENSION}', period=period, start_date=startDate, end_date=endDate)
+    report.novel = prjFile.novel
+    report.wcLogSeries = WcLogSeries(prjFile.wcLog, prjFile.wcLogUpdate)
+    report.write()
+    return report.filePath
+
+
+def positive_int(text):
+    """Return a positive integer; raise ValueError if text is not one."""
+    value = int(text)
+    if value < 1:
+        raise ValueError
+
+    return value
+
+
+def iso_date(text):
+    """Return an ISO date string; raise ValueError if text is not one."""
+    return ordinal_to_iso(iso_to_ordinal(text))
+
+
+def _run_export(prjFilePath, period, outputDir, exportFormat, startDate, endDate):
+    """Return a tuple (project path, report path or None, duration, error message or None).
+
+    Run in a worker process.
+    """
+    startTime = time.perf_counter()
+    try:
+        reportPath = export_report(prjFilePath, period, outputDir, exportFormat, startDate, endDate)
+    except Exception as ex:
+        return prjFilePath, None, time.perf_counter() - startTime, str(ex)
+
+    return prjFilePath, reportPath, time.perf_counter() - startTime, None
+
+
+def main(sourcePaths, workers=None, period='day', outputDir=None, exportFormat='html', startDate=None, endDate=None):
+    """Export the reports of all projects found. Return the number of failures."""
+    prjFiles = find_projects(sourcePaths)
+    if not prjFiles:
+        print('No project files found.')
+        return 0
+
+    failures = 0
+    startTime = time.perf_counter()
+    outputDirs = get_output_dirs(prjFiles, outputDir)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_export, prjFilePath, period, outputDirs[prjFilePath], exportFormat, startDate, endDate) for prjFilePath in prjFiles]
+        for future in as_completed(futures):
+            prjFilePath, reportPath, duration, message = future.result()
+            if message is None:
+                print(f'OK      {duration:8.3f} s  {norm_path(prjFilePath)} -> {norm_path(reportPath)}')
+            else:
+                failures += 1
+                print(f'FAILED  {duration:8.3f} s  {norm_path(prjFilePath)}: {message}')
+    print(f'{len(prjFiles) - failures} of {len(prjFiles)} reports written in {time.perf_counter() - startTime:.3f} s.')
+    return failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Export word count log reports for many novelyst projects in parallel.',
+        epilog='')
+    parser.add_argument('sourcePaths', metavar='sourcepath', nargs='+',
+                        help='project file, directory, or glob pattern')
+    parser.add_argument('-w', dest='workers', type=positive_int, default=None,
+                        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('-p', dest='period', choices=PERIODS, default='day',
+                        help='aggregation period (default: day)')
+    parser.add_argument('-f', dest='exportFormat', choices=list(EXPORT_CLASSES), default='html',
+                        help='report format (default: html)')
+    parser.add_argument('--from', dest='startDate', type=iso_date, default=None,
+                        help="first day to export, e.g. 2023-01-01 (default: the log's first day)")
+    parser.add_argument('--to', dest='endDate', type=iso_date, default=None,
+                        help="last day to export (default: the log's last day)")
+    parser.add_argument('-o', dest='outputDir', default=None,
+                        help='output directory (default: the project directories)')
+    args = parser.parse_args()
+    if main(args.sourcePaths, args.workers, args.period, args.outputDir, args.exportFormat, args.startDate, args.endDate):
+        sys.exit(1)
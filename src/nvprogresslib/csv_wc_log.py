@@ -0,0 +1,28 @@
+"""Provide a class for CSV word count log file representation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from nvprogresslib.wc_log_file import WcLogFile
+
+
+class CsvWcLog(WcLogFile):
+    """Class for CSV word count log file representation.
+    
+    The first line holds the column names; 
+    the fields are dates or period keys, and integers, so they need no quoting.
+    """
+    DESCRIPTION = 'CSV word count log'
+    EXTENSION = '.csv'
+
+    _fileHeader = 'date,count,countDelta,totalCount,totalCountDelta\r\n'
+
+    def _get_lines(self):
+        """Generate the lines to be written to the output file.
+        
+        Overrides the superclass method.
+        """
+        yield self._fileHeader
+        for row in self._get_rows():
+            yield '%s,%d,%d,%d,%d\r\n' % row
@@ -0,0 +1,29 @@
+"""Provide a class for JSON Lines word count log file representation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from nvprogresslib.wc_log_file import WcLogFile
+
+
+class JsonlWcLog(WcLogFile):
+    """Class for JSON Lines word count log file representation.
+    
+    Each line holds a JSON object with the keys 
+    date, count, countDelta, totalCount, and totalCountDelta.
+    """
+    DESCRIPTION = 'JSON Lines word count log'
+    EXTENSION = '.jsonl'
+
+    _wcDayTemplate = '{"date": "%s", "count": %d, "countDelta": %d, "totalCount": %d, "totalCountDelta": %d}\n'
+    # Dates and period keys need no JSON escaping.
+
+    def _get_lines(self):
+        """Generate the lines to be written to the output file.
+        
+        Overrides the superclass method.
+        """
+        template = self._wcDayTemplate
+        for row in self._get_rows():
+            yield template % row
@@ -0,0 +1,82 @@
+"""Provide a class for ODS word count log file representation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import zipfile
+from xml.sax.saxutils import escape
+from pywriter.pywriter_globals import *
+from nvprogresslib.wc_log_file import WcLogFile
+
+
+class OdsWcLog(WcLogFile):
+    """Class for ODS word count log file representation.
+    
+    The spreadsheet is written as a zip archive, 
+    streaming the table rows into the content.xml entry.
+    """
+    DESCRIPTION = 'ODS word count log'
+    EXTENSION = '.ods'
+
+    _MIMETYPE = 'application/vnd.oasis.opendocument.spreadsheet'
+
+    _manifest = f'''<?xml version="1.0" encoding="UTF-8"?>
+<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">
+ <manifest:file-entry manifest:full-path="/" manifest:version="1.2" manifest:media-type="{_MIMETYPE}"/>
+ <manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>
+</manifest:manifest>
+'''
+
+    _fileHeader = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">
+<office:body>
+<office:spreadsheet>
+<table:table table:name="{0}">
+<table:table-row>
+'''
+
+    _headingCell = '<table:table-cell office:value-type="string"><text:p>{0}</text:p></table:table-cell>\n'
+
+    _wcDayTemplate = '''<table:table-row>
+<table:table-cell office:value-type="string"><text:p>%s</text:p></table:table-cell>
+<table:table-cell office:value-type="float" office:value="%d"/>
+<table:table-cell office:value-type="float" office:value="%d"/>
+<table:table-cell office:value-type="float" office:value="%d"/>
+<table:table-cell office:value-type="float" office:value="%d"/>
+</table:table-row>
+'''
+
+    _fileFooter = '''</table:table>
+</office:spreadsheet>
+</office:body>
+</office:document-content>
+'''
+
+    def _write_content(self, f):
+        """Write the zip archive to a binary file object.
+        
+        Overrides the superclass method.
+        """
+        with zipfile.ZipFile(f, 'w') as odsFile:
+            odsFile.writestr('mimetype', self._MIMETYPE, compress_type=zipfile.ZIP_STORED)
+            # The mimetype must be the first entry, uncompressed.
+            odsFile.writestr('META-INF/manifest.xml', self._manifest, compress_type=zipfile.ZIP_DEFLATED)
+            contentInfo = zipfile.ZipInfo('content.xml')
+            contentInfo.compress_type = zipfile.ZIP_DEFLATED
+            with odsFile.open(contentInfo, 'w') as content:
+                super()._write_content(content)
+
+    def _get_lines(self):
+        """Generate the lines of the content.xml entry.
+        
+        Overrides the superclass method.
+        """
+        yield self._fileHeader.format(escape(_('Word count log'), {'"': '&quot;'}))
+        for heading in (_('Date'), _('Word count'), _('increment'), _('with unused'), _('increment')):
+            yield self._headingCell.format(escape(heading))
+        yield '</table:table-row>\n'
+        template = self._wcDayTemplate
+        for row in self._get_rows():
+            yield template % row
+        yield self._fileFooter
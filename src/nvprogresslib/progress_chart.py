@@ -0,0 +1,301 @@
+"""Provide a tkinter widget for a downsampled progress chart.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from bisect import bisect_left
+import tkinter as tk
+from nvprogresslib.nvprogress_globals import *
+from nvprogresslib.wc_log_series import ordinal_to_iso
+
+
+class MinMaxPyramid:
+    """Range minimum/maximum lookup for a sequence of numbers.
+
+    Level k holds the minima and maxima of blocks of 2**k values,
+    so any range is covered by O(log n) blocks.
+
+    Public methods:
+        range_minmax(start, end) -- Return the minimum and maximum of values[start:end].
+        update_last(value) -- Replace the last value.
+    """
+
+    def __init__(self, values):
+        """Build the pyramid.
+
+        Positional arguments:
+            values -- sequence of numbers.
+        """
+        self._minima = [list(values)]
+        self._maxima = [self._minima[0]]
+        while len(self._minima[-1]) > 1:
+            self._minima.append(self._reduce(self._minima[-1], min))
+            self._maxima.append(self._reduce(self._maxima[-1], max))
+
+    def range_minmax(self, start, end):
+        """Return a tuple (minimum, maximum) of the values with indices start to end-1.
+
+        Return (None, None) if the range is empty.
+        """
+        low = None
+        high = None
+        level = 0
+        while start < end:
+            blocks = []
+            if start & 1:
+                blocks.append(start)
+                start += 1
+            if end & 1:
+                end -= 1
+                blocks.append(end)
+            for block in blocks:
+                if low is None or self._minima[level][block] < low:
+                    low = self._minima[level][block]
+                if high is None or self._maxima[level][block] > high:
+                    high = self._maxima[level][block]
+            start >>= 1
+            end >>= 1
+            level += 1
+        return low, high
+
+    def update_last(self, value):
+        """Replace the last value, and update the blocks containing it."""
+        i = len(self._minima[0]) - 1
+        self._minima[0][i] = value
+        for level in range(1, len(self._minima)):
+            i >>= 1
+            pair = slice(2 * i, 2 * i + 2)
+            self._minima[level][i] = min(self._minima[level - 1][pair])
+            self._maxima[level][i] = max(self._maxima[level - 1][pair])
+
+    def _reduce(self, values, function):
+        """Return a list of function(pair) for consecutive pairs of values."""
+        reduced = list(map(function, values[0::2], values[1::2]))
+        if len(values) & 1:
+            reduced.append(values[-1])
+        return reduced
+
+
+class ProgressChart(tk.Canvas):
+    """Canvas plotting the word count and its changes over time.
+
+    The plot is downsampled to the canvas width:
+    Each pixel column shows the minimum and maximum word count,
+    and the net word count change of the days it covers.
+    Thus, the drawing cost depends on the canvas width and the
+    zoomed range, but not on the log length.
+
+    Use the mouse wheel to zoom, and drag to pan.
+
+    Public methods:
+        set_series(wcLogSeries) -- Set the series to plot.
+        update_series(changedOrdinal) -- Update the chart after the series has changed.
+        draw() -- Redraw the chart.
+        reset_view() -- Show the whole series.
+    """
+    _MARGIN = 40
+    _MIN_SPAN = 7
+    # Minimum number of days in view.
+    _ZOOM_FACTOR = 1.25
+
+    def __init__(self, master=None, **kw):
+        super().__init__(master, background='white', highlightthickness=0, **kw)
+        self._series = None
+        self._length = 0
+        self._lastOrdinal = None
+        self._pyramid = None
+        self._viewStart = None
+        self._viewEnd = None
+        # Ordinal range in view; the end is exclusive.
+        self._dragX = None
+        self._redrawPending = False
+        self.bind('<Configure>', self._schedule_draw)
+        self.bind('<MouseWheel>', self._on_mouse_wheel)
+        self.bind('<Button-4>', self._on_mouse_wheel)
+        self.bind('<Button-5>', self._on_mouse_wheel)
+        self.bind('<ButtonPress-1>', self._on_drag_start)
+        self.bind('<B1-Motion>', self._on_drag)
+        self.bind('<Double-Button-1>', self.reset_view)
+
+    def set_series(self, wcLogSeries):
+        """Set the series to plot, show all of it, and redraw the chart if visible.
+
+        Positional arguments:
+            wcLogSeries -- WcLogSeries instance.
+        """
+        self._series = wcLogSeries
+        self._pyramid = None
+        self._update_length()
+        self.reset_view()
+
+    def update_series(self, changedOrdinal):
+        """Update the chart after days of the series have been changed or added.
+
+        Positional arguments:
+            changedOrdinal: int -- ordinal of the earliest day changed or added.
+
+        If only the last day has changed, which is the case when today's count
+        is refreshed, only the blocks containing it are updated.
+        Otherwise, the lookup structure is rebuilt with the next drawing.
+        A view showing the last day is extended to the days added.
+        """
+        if self._series is None:
+            return
+
+        series = self._series
+        i = bisect_left(series.ordinals, changedOrdinal)
+        if self._pyramid is not None and len(series) == self._length and i == self._length - 1:
+            self._pyramid.update_last(series.counts[i])
+        else:
+            self._pyramid = None
+        showsLastDay = self._viewEnd is not None and self._viewEnd > self._lastOrdinal
+        self._update_length()
+        if self._viewStart is None:
+            self.reset_view()
+        elif showsLastDay and self._viewEnd <= self._lastOrdinal:
+            self._set_view(self._viewStart, self._lastOrdinal + 1 - self._viewStart)
+        else:
+            self._schedule_draw()
+
+    def reset_view(self, event=None):
+        """Show the whole series."""
+        if self._series is None or not len(self._series):
+            self._viewStart = None
+            self._viewEnd = None
+        else:
+            self._viewStart = self._series.ordinals[0]
+            self._viewEnd = max(self._series.ordinals[-1] + 1, self._viewStart + self._MIN_SPAN)
+        self._schedule_draw()
+
+    def draw(self):
+        """Redraw the chart for the range in view."""
+        self._redrawPending = False
+        self.delete('all')
+        if self._viewStart is None:
+            return
+
+        width = self.winfo_width() - 2 * self._MARGIN
+        height = self.winfo_height() - 2 * self._MARGIN
+        if width < 2 or height < 20:
+            # The chart is not visible.
+            return
+
+        if self._pyramid is None:
+            self._pyramid = MinMaxPyramid(self._series.counts)
+        ordinals = self._series.ordinals
+        counts = self._series.counts
+
+        countHeight = height * 2 // 3
+        deltaTop = self._MARGIN + countHeight + self._MARGIN // 2
+        deltaHeight = height - countHeight - self._MARGIN // 2
+        span = self._viewEnd - self._viewStart
+
+        #--- Collect the pixel columns.
+        columns = []
+        # (x, minimum count, maximum count, net change)
+        start = bisect_left(ordinals, self._viewStart)
+        for x in range(width):
+            end = bisect_left(ordinals, self._viewStart + span * (x + 1) / width, start)
+            if end > start:
+                low, high = self._pyramid.range_minmax(start, end)
+                if start > 0:
+                    delta = counts[end - 1] - counts[start - 1]
+                else:
+                    delta = counts[end - 1]
+                columns.append((self._MARGIN + x, low, high, delta))
+            start = end
+        if not columns:
+            return
+
+        #--- Scale.
+        countLow = min(column[1] for column in columns)
+        countHigh = max(column[2] for column in columns)
+        countRange = max(countHigh - countLow, 1)
+        deltaRange = max(max(abs(column[3]) for column in columns), 1)
+        deltaBase = deltaTop + deltaHeight // 2
+
+        def count_y(count):
+            return self._MARGIN + countHeight - (count - countLow) * countHeight / countRange
+
+        #--- Plot the word count.
+        coords = []
+        for x, low, high, delta in columns:
+            coords.extend((x, count_y(high)))
+            if low != high:
+                coords.extend((x, count_y(low)))
+        if len(coords) >= 4:
+            self.create_line(*coords, fill='blue')
+        else:
+            self.create_oval(coords[0] - 2, coords[1] - 2, coords[0] + 2, coords[1] + 2, fill='blue', outline='blue')
+
+        #--- Plot the changes.
+        self.create_line(self._MARGIN, deltaBase, self._MARGIN + width, deltaBase, fill='grey')
+        for x, low, high, delta in columns:
+            if delta:
+                if delta > 0:
+                    color = 'green'
+                else:
+                    color = 'red'
+                self.create_line(x, deltaBase, x, deltaBase - delta * (deltaHeight // 2) / deltaRange, fill=color)
+
+        #--- Labels.
+        self.create_text(self._MARGIN, self._MARGIN - 5, anchor='sw', text=f'{_("Word count")}: {countLow} - {countHigh}')
+        self.create_text(self._MARGIN, deltaTop - 5, anchor='sw', text=f'{_("Changes")}: ± {deltaRange}')
+        self.create_text(self._MARGIN, self._MARGIN + height + 5, anchor='nw', text=ordinal_to_iso(self._viewStart))
+        self.create_text(self._MARGIN + width, self._MARGIN + height + 5, anchor='ne', text=ordinal_to_iso(self._viewEnd - 1))
+
+    def _update_length(self):
+        """Remember the length and the last day of the series, to tell the days added."""
+        self._length = len(self._series)
+        if self._length:
+            self._lastOrdinal = self._series.ordinals[-1]
+        else:
+            self._lastOrdinal = None
+
+    def _schedule_draw(self, event=None):
+        """Redraw when idle, coalescing multiple requests."""
+        if not self._redrawPending:
+            self._redrawPending = True
+            self.after_idle(self.draw)
+
+    def _on_mouse_wheel(self, event):
+        """Zoom in or out around the mouse pointer."""
+        if self._viewStart is None:
+            return
+
+        if event.num == 4 or event.delta > 0:
+            factor = 1 / self._ZOOM_FACTOR
+        else:
+            factor = self._ZOOM_FACTOR
+        width = max(self.winfo_width() - 2 * self._MARGIN, 1)
+        fraction = min(max((event.x - self._MARGIN) / width, 0), 1)
+        span = self._viewEnd - self._viewStart
+        pivot = self._viewStart + span * fraction
+        newSpan = max(int(span * factor), self._MIN_SPAN)
+        self._set_view(int(pivot - newSpan * fraction), newSpan)
+
+    def _on_drag_start(self, event):
+        self._dragX = event.x
+
+    def _on_drag(self, event):
+        """Pan the range in view."""
+        if self._viewStart is None or self._dragX is None:
+            return
+
+        width = max(self.winfo_width() - 2 * self._MARGIN, 1)
+        span = self._viewEnd - self._viewStart
+        shift = int((self._dragX - event.x) * span / width)
+        if shift:
+            self._dragX = event.x
+            self._set_view(self._viewStart + shift, span)
+
+    def _set_view(self, start, span):
+        """Set the range in view, limited to the series, and redraw."""
+        first = self._series.ordinals[0]
+        last = self._series.ordinals[-1] + 1
+        span = min(span, max(last - first, self._MIN_SPAN))
+        start = max(min(start, last - span), first)
+        self._viewStart = start
+        self._viewEnd = start + span
+        self._schedule_draw()
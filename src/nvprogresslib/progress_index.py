@@ -0,0 +1,168 @@
+"""Provide a class for a persistent progress index sidecar file.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from nvprogresslib.wc_log_series import WcLogSeries
+from nvprogresslib.wc_log_series import TYPECODE
+
+
+class ProgressIndex:
+    """Persistent sidecar index of a project's progress data.
+
+    The index file is stored next to the project file.
+    It holds the merged daily word count series, the last computed
+    scene word and letter counts, and the writing statistics state.
+    The index is valid as long as the project file's modification time
+    and size are unchanged.
+
+    Public methods:
+        read() -- Load the index, if valid. Return True on success.
+        write(wcLogSeries, sceneCounts, statistics) -- Save the index for the actual project file.
+
+    Public instance variables:
+        filePath: str -- path to the index file.
+        wcLogSeries -- WcLogSeries instance, or None if not loaded.
+        sceneCounts -- dict: key = scene ID, value = (word count, letter count).
+        statistics -- dict: WcStatistics state, or None.
+    """
+    SUFFIX = '_progress'
+    EXTENSION = '.idx'
+
+    _MAGIC = b'NVPI'
+    _VERSION = 2
+    _HEADER = struct.Struct('<4sHqqIIII')
+    # magic, version, project file mtime (ns), project file size,
+    # number of days, number of scenes, length of the scene ID block,
+    # length of the JSON encoded statistics state.
+
+    def __init__(self, prjFilePath):
+        """Initialize instance variables.
+
+        Positional arguments:
+            prjFilePath: str -- path to the project file.
+        """
+        self._prjFilePath = prjFilePath
+        root, extension = os.path.splitext(prjFilePath)
+        self.filePath = f'{root}{self.SUFFIX}{self.EXTENSION}'
+        self.wcLogSeries = None
+        self.sceneCounts = {}
+        self.statistics = None
+
+    def read(self):
+        """Load the index, if valid for the project file.
+
+        Return True on success.
+        Return False if the index is missing, stale, or corrupted.
+        """
+        try:
+            mtime, size = self._get_project_stamp()
+            with open(self.filePath, 'rb') as f:
+                magic, version, idxMtime, idxSize, days, scenes, idLength, statLength = self._HEADER.unpack(f.read(self._HEADER.size))
+                if magic != self._MAGIC or version != self._VERSION:
+                    return False
+
+                if idxMtime != mtime or idxSize != size:
+                    return False
+
+                ordinals = self._read_array(f, TYPECODE, days)
+                counts = self._read_array(f, TYPECODE, days)
+                totalCounts = self._read_array(f, TYPECODE, days)
+                if idLength:
+                    scIds = f.read(idLength).decode('utf-8').split('\n')
+                else:
+                    scIds = []
+                wordCounts = self._read_array(f, TYPECODE, scenes)
+                letterCounts = self._read_array(f, TYPECODE, scenes)
+                if statLength:
+                    statistics = json.loads(f.read(statLength).decode('utf-8'))
+                else:
+                    statistics = None
+        except:
+            return False
+
+        if len(scIds) != scenes:
+            return False
+
+        self.wcLogSeries = WcLogSeries.from_arrays(ordinals, counts, totalCounts)
+        self.sceneCounts = dict(zip(scIds, zip(wordCounts, letterCounts)))
+        self.statistics = statistics
+        return True
+
+    def write(self, wcLogSeries, sceneCounts, statistics=None):
+        """Save the index for the actual state of the project file.
+
+        Positional arguments:
+            wcLogSeries -- WcLogSeries instance holding the project file's merged log.
+            sceneCounts -- dict: key = scene ID, value = (word count, letter count).
+
+        Optional arguments:
+            statistics -- dict: WcStatistics state referring to wcLogSeries.
+
+        The index is a cache, so a failure is silently ignored.
+        The index file is replaced in one atomic step.
+        """
+        scIds = list(sceneCounts)
+        idBlock = '\n'.join(scIds).encode('utf-8')
+        wordCounts = array(TYPECODE, [sceneCounts[scId][0] for scId in scIds])
+        letterCounts = array(TYPECODE, [sceneCounts[scId][1] for scId in scIds])
+        if statistics is not None:
+            statBlock = json.dumps(statistics).encode('utf-8')
+        else:
+            statBlock = b''
+        tempPath = None
+        try:
+            mtime, size = self._get_project_stamp()
+            fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(self.filePath)))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._HEADER.pack(
+                    self._MAGIC,
+                    self._VERSION,
+                    mtime,
+                    size,
+                    len(wcLogSeries),
+                    len(scIds),
+                    len(idBlock),
+                    len(statBlock),
+                    ))
+                self._write_array(f, wcLogSeries.ordinals)
+                self._write_array(f, wcLogSeries.counts)
+                self._write_array(f, wcLogSeries.totalCounts)
+                f.write(idBlock)
+                self._write_array(f, wordCounts)
+                self._write_array(f, letterCounts)
+                f.write(statBlock)
+            os.replace(tempPath, self.filePath)
+        except:
+            if tempPath is not None:
+                try:
+                    os.remove(tempPath)
+                except:
+                    pass
+
+    def _get_project_stamp(self):
+        """Return a tuple (modification time in ns, size) of the project file."""
+        stat = os.stat(self._prjFilePath)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_array(self, f, typecode, length):
+        """Return an array read from a file in little-endian byte order."""
+        data = array(typecode)
+        data.fromfile(f, length)
+        if sys.byteorder != 'little':
+            data.byteswap()
+        return data
+
+    def _write_array(self, f, data):
+        """Write an array to a file in little-endian byte order."""
+        if sys.byteorder != 'little':
+            data = array(data.typecode, data)
+            data.byteswap()
+        data.tofile(f)
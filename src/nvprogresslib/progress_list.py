@@ -0,0 +1,332 @@
+"""Provide a tkinter widget for a virtual word count log list.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from bisect import bisect_left
+from bisect import bisect_right
+from tkinter import ttk
+from nvprogresslib.nvprogress_globals import *
+from nvprogresslib.wc_log_series import PERIODS
+from nvprogresslib.wc_log_series import get_period_start
+
+
+def get_tags(delta):
+    """Return the row tags for a word count difference."""
+    if delta > 0:
+        return ('positive')
+
+    return ('negative')
+
+
+class ProgressList(ttk.Frame):
+    """List of word count log rows, the most recent entry at the top.
+
+    The row model is a word count series: The rows are the series' days
+    with word count changes, referred to by their indices, not by their texts.
+    When aggregating by a period, the rows are the periods with word count
+    changes, referred to by the index ends of their days.
+    With a date range, the rows are limited to the days within; their
+    array indices are looked up by binary search, so that only the rows
+    inside the range are ever built.
+    Only the rows within the visible scroll window, plus a buffer,
+    are formatted and inserted into the tree. More rows are inserted
+    when scrolling, and rows scrolled far out of view are removed again.
+    The scrollbar refers to the whole list, not to the inserted rows.
+
+    Public methods:
+        set_series(series, period='day', startOrdinal=None, endOrdinal=None) -- Set the row model.
+        update_series(changedOrdinal) -- Update the row model after the series has changed.
+        refresh() -- Reconcile the tree with the row model.
+        reset() -- Clear the tree.
+
+    Public instance variables:
+        tree -- ttk.Treeview instance showing the rows.
+    """
+    _PAGE_SIZE = 50
+    # Number of rows to insert at a time.
+    _BUFFER_ROWS = 20
+    # Minimum number of inserted rows above and below the visible scroll window.
+    _MAX_ROWS = 200
+    # Number of inserted rows beyond which the rows out of view are removed.
+    PERIOD_TITLES = (_('Daily'), _('Weekly'), _('Monthly'), _('Yearly'))
+    # Titles corresponding to PERIODS.
+    COLUMNS = (
+        'date',
+        'wordCount',
+        'wordCountDelta',
+        'totalWordCount',
+        'totalWordCountDelta',
+        )
+
+    def __init__(self, master=None, **kw):
+        """Create the tree with the log columns.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(master, **kw)
+        self.tree = ttk.Treeview(self, selectmode='none', columns=self.COLUMNS + ('spacer',))
+        self._scrollY = ttk.Scrollbar(self.tree, orient='vertical', command=self._on_scrollbar)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self._scrollY.pack(side='right', fill='y')
+        self.tree.pack(fill='both', expand=True)
+        self.tree.heading('date', text=_('Date'))
+        self.tree.heading('wordCount', text=_('Word count'))
+        self.tree.heading('totalWordCount', text=_('With unused'))
+        for column in self.COLUMNS:
+            self.tree.column(column, anchor='center', width=100, stretch=False)
+        self.tree.column('#0', width=0, stretch=False)
+        self.tree.tag_configure('positive', foreground='black')
+        self.tree.tag_configure('negative', foreground='red')
+
+        self._series = None
+        # WcLogSeries instance whose days with word count changes are the rows.
+        self._period = None
+        # str -- aggregation period, one of PERIODS.
+        self._ends = None
+        # array of the index ends of the periods with word count changes; None when listing days.
+        self._startOrdinal = None
+        self._endOrdinal = None
+        # Ordinals of the first day and of the day after the date range, or None for no limit.
+        self._start = 0
+        self._end = 0
+        # Array index range of the days within the date range.
+        self._changedStart = 0
+        self._changedEnd = None
+        # Position range in the series' changed days of the days within the date range;
+        # the end is None without a date range, so that all changed days are listed.
+        self._windowStart = 0
+        # Display position of the first row inserted into the tree.
+        self._shownRows = []
+        # list of the (iid, columns, nodeTags) tuples inserted into the tree, in display order.
+        self._shownToEnd = False
+        # True if the rows inserted into the tree reached the end of the list.
+        self._scrollPending = False
+
+    def set_series(self, series, period='day', startOrdinal=None, endOrdinal=None):
+        """Set the row model.
+
+        Positional arguments:
+            series -- WcLogSeries instance whose days with word count changes are to be listed.
+
+        Optional arguments:
+            period: str -- aggregation period, one of PERIODS.
+            startOrdinal: int -- ordinal of the first day to list. Default: no limit.
+            endOrdinal: int -- ordinal of the day after the last day to list. Default: no limit.
+
+        The series is referred to, not copied. After changing it, call update_series().
+        The tree is not changed before refresh() is called.
+        """
+        self._series = series
+        if period != self._period:
+            periodTitle = self.PERIOD_TITLES[PERIODS.index(period)]
+            self.tree.heading('wordCountDelta', text=periodTitle)
+            self.tree.heading('totalWordCountDelta', text=periodTitle)
+            self._period = period
+        self._startOrdinal = startOrdinal
+        self._endOrdinal = endOrdinal
+        self._set_range()
+        if period == 'day':
+            self._ends = None
+        else:
+            self._ends = series.period_ends(period, self._start, self._end)
+
+    def update_series(self, changedOrdinal):
+        """Update the row model after the series has changed.
+
+        Positional arguments:
+            changedOrdinal: int -- ordinal of the earliest day changed in the series.
+
+        The rows of the days are the series' changed days, which are always up to date;
+        only the date range is looked up again, since days may have been inserted.
+        The rows of the periods are recalculated from the changed day's period on.
+        """
+        self._set_range()
+        if self._ends is None:
+            return
+
+        series = self._series
+        start = bisect_left(series.ordinals, get_period_start(changedOrdinal, self._period))
+        del self._ends[bisect_right(self._ends, start):]
+        if self._ends:
+            start = self._ends[-1]
+        else:
+            start = self._start
+        self._ends.extend(series.period_ends(self._period, start, self._end))
+
+    def refresh(self):
+        """Reconcile the rows inserted into the tree with the row model.
+
+        Update the rows at the display positions inserted before, or the first page:
+        Insert new rows, update changed rows, and delete vanished rows.
+        Leave unchanged rows untouched.
+        """
+        rowCount = self._get_row_count()
+        start = min(self._windowStart, max(rowCount - self._PAGE_SIZE, 0))
+        if self._shownToEnd:
+            # The end of the list was shown, so show the additional rows as well.
+            end = rowCount
+        else:
+            end = min(start + max(len(self._shownRows), self._PAGE_SIZE), rowCount)
+        oldRows = {}
+        for iid, columns, nodeTags in self._shownRows:
+            oldRows[iid] = (columns, nodeTags)
+        newRows = [self._get_row(i) for i in range(start, end)]
+        newIids = set(iid for iid, columns, nodeTags in newRows)
+        vanished = [iid for iid in oldRows if not iid in newIids]
+        if vanished:
+            self.tree.delete(*vanished)
+        for i, row in enumerate(newRows):
+            iid, columns, nodeTags = row
+            if not iid in oldRows:
+                self._insert_row(i, row)
+            elif oldRows[iid] != (columns, nodeTags):
+                self.tree.item(iid, values=columns, tags=nodeTags)
+        self._windowStart = start
+        self._shownRows = newRows
+        self._shownToEnd = end == rowCount
+
+    def reset(self):
+        """Clear the tree."""
+        self.tree.delete(*self.tree.get_children(''))
+        self._windowStart = 0
+        self._shownRows = []
+        self._shownToEnd = False
+
+    def _get_row_count(self):
+        """Return the number of rows of the row model."""
+        if self._series is None:
+            return 0
+
+        if self._ends is not None:
+            return len(self._ends)
+
+        if self._changedEnd is None:
+            return len(self._series.changed)
+
+        return self._changedEnd - self._changedStart
+
+    def _get_row(self, position):
+        """Return a tuple (iid, columns, nodeTags) of the row at a position in display order."""
+        r = self._get_row_count() - 1 - position
+        if self._ends is None:
+            values = self._series.get_row(self._series.changed[self._changedStart + r])
+        elif r:
+            values = self._series.get_period_row(self._period, self._ends[r - 1], self._ends[r])
+        else:
+            values = self._series.get_period_row(self._period, self._start, self._ends[0])
+        wc, countInt, countDiffInt, totalCountInt, totalCountDiffInt = values
+        columns = [
+            wc,
+            str(countInt),
+            str(countDiffInt),
+            str(totalCountInt),
+            str(totalCountDiffInt),
+            ]
+        return wc, columns, get_tags(countDiffInt)
+
+    def _set_range(self):
+        """Look up the array indices and the changed day positions of the date range."""
+        self._start, self._end = self._series.index_range(self._startOrdinal, self._endOrdinal)
+        if self._startOrdinal is None and self._endOrdinal is None:
+            self._changedStart = 0
+            self._changedEnd = None
+        else:
+            self._changedStart, self._changedEnd = self._series.changed_range(self._start, self._end)
+
+    def _on_tree_scroll(self, first, last):
+        """Update the scrollbar, and insert more rows when getting near the first or the last inserted row.
+
+        Positional arguments:
+            first, last: str -- visible fractions of the inserted rows, as passed by the yscrollcommand.
+        """
+        first = float(first)
+        last = float(last)
+        shownCount = len(self._shownRows)
+        rowCount = self._get_row_count()
+        if not shownCount:
+            self._scrollY.set(first, last)
+            return
+
+        self._scrollY.set(
+            (self._windowStart + first * shownCount) / rowCount,
+            (self._windowStart + last * shownCount) / rowCount,
+            )
+        if self._scrollPending:
+            return
+
+        if (1.0 - last) * shownCount < self._BUFFER_ROWS and self._windowStart + shownCount < rowCount:
+            self._scrollPending = True
+            self.after_idle(self._show_next_rows)
+        elif first * shownCount < self._BUFFER_ROWS and self._windowStart > 0:
+            self._scrollPending = True
+            self.after_idle(self._show_previous_rows)
+
+    def _on_scrollbar(self, *args):
+        """Scroll the tree; replace the inserted rows when dragging the scrollbar beyond them.
+
+        Positional arguments:
+            args -- scrollbar command, e.g. ('moveto', fraction) or ('scroll', number, 'units').
+        """
+        rowCount = self._get_row_count()
+        if args[0] != 'moveto' or not rowCount:
+            self.tree.yview(*args)
+            return
+
+        position = min(max(int(float(args[1]) * rowCount), 0), rowCount - 1)
+        if not self._windowStart <= position < self._windowStart + len(self._shownRows):
+            self._show_window(position)
+        self.tree.yview_moveto((position - self._windowStart) / len(self._shownRows))
+
+    def _show_window(self, position):
+        """Replace the inserted rows by a page of rows around a position in display order."""
+        self.reset()
+        rowCount = self._get_row_count()
+        self._windowStart = max(min(position - self._BUFFER_ROWS, rowCount - self._PAGE_SIZE), 0)
+        end = min(self._windowStart + self._PAGE_SIZE, rowCount)
+        self._shownRows = [self._get_row(i) for i in range(self._windowStart, end)]
+        for row in self._shownRows:
+            self._insert_row('end', row)
+        self._shownToEnd = end == rowCount
+
+    def _show_next_rows(self):
+        """Insert the next page of rows below the inserted rows, and remove the rows far above."""
+        self._scrollPending = False
+        start = self._windowStart + len(self._shownRows)
+        rowCount = self._get_row_count()
+        end = min(start + self._PAGE_SIZE, rowCount)
+        rows = [self._get_row(i) for i in range(start, end)]
+        for row in rows:
+            self._insert_row('end', row)
+        self._shownRows.extend(rows)
+        self._shownToEnd = end == rowCount
+        excess = len(self._shownRows) - self._MAX_ROWS
+        if excess > 0:
+            self.tree.delete(*[row[0] for row in self._shownRows[:excess]])
+            del self._shownRows[:excess]
+            self._windowStart += excess
+            self.tree.yview_scroll(-excess, 'units')
+            # Keep the same rows in view.
+
+    def _show_previous_rows(self):
+        """Insert the previous page of rows above the inserted rows, and remove the rows far below."""
+        self._scrollPending = False
+        start = max(self._windowStart - self._PAGE_SIZE, 0)
+        rows = [self._get_row(i) for i in range(start, self._windowStart)]
+        for i, row in enumerate(rows):
+            self._insert_row(i, row)
+        self._shownRows[:0] = rows
+        self.tree.yview_scroll(self._windowStart - start, 'units')
+        # Keep the same rows in view.
+        self._windowStart = start
+        excess = len(self._shownRows) - self._MAX_ROWS
+        if excess > 0:
+            self.tree.delete(*[row[0] for row in self._shownRows[-excess:]])
+            del self._shownRows[-excess:]
+            self._shownToEnd = False
+
+    def _insert_row(self, index, row):
+        """Insert a (iid, columns, nodeTags) row into the tree."""
+        iid, columns, nodeTags = row
+        self.tree.insert('', index, iid=iid, values=columns, tags=nodeTags, open=True)
@@ -9,10 +9,33 @@ from datetime import date
 import tkinter as tk
 from tkinter import ttk
 from nvprogresslib.nvprogress_globals import *
+from nvprogresslib.progress_chart import ProgressChart
+from nvprogresslib.progress_index import ProgressIndex
+from nvprogresslib.progress_list import ProgressList
+from nvprogresslib.timing_log import timingLog
+from nvprogresslib.wc_log_series import WcLogSeries
+from nvprogresslib.wc_log_series import PERIODS
+from nvprogresslib.wc_log_series import iso_to_ordinal
+from nvprogresslib.wc_log_series import ordinal_to_iso
+from nvprogresslib.wc_statistics import WcStatistics
 
 
 class ProgressViewer(tk.Toplevel):
     _KEY_QUIT_PROGRAM = ('<Control-q>', 'Ctrl-Q')
+    _POLL_INTERVAL = 50
+    # Milliseconds between checks whether the background word count is finished.
+    _WATCH_INTERVAL = 1000
+    # Milliseconds between checks of the project's modification flag.
+    _REFRESH_DELAY = 2000
+    # Milliseconds without further project changes before refreshing.
+    _RECOUNT_INTERVAL = 10000
+    # Milliseconds between refreshes while the project is modified.
+    _TIMED_PHASES = (
+        ('build_tree.merge', 'merge'),
+        ('build_tree.count', 'count'),
+        ('build_tree.tree', 'tree'),
+        )
+    # Timing names and their short titles displayed in the status line.
 
     def __init__(self, plugin, ui):
         self._ui = ui
@@ -24,86 +47,143 @@ class ProgressViewer(tk.Toplevel):
         self.protocol("WM_DELETE_WINDOW", self.on_quit)
         self.bind(self._KEY_QUIT_PROGRAM[0], self.on_quit)
 
-        #--- Tree for log view.
-        columns = (
-            'date',
-            'wordCount',
-            'wordCountDelta',
-            'totalWordCount',
-            'totalWordCountDelta',
-            'spacer',
-            )
-        self.tree = ttk.Treeview(self, selectmode='none', columns=columns)
-        scrollY = ttk.Scrollbar(self.tree, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollY.set)
-        scrollY.pack(side='right', fill='y')
-        self.tree.pack(fill='both', expand=True)
-        self.tree.heading('date', text=_('Date'))
-        self.tree.heading('wordCount', text=_('Word count'))
-        self.tree.heading('wordCountDelta', text=_('Daily'))
-        self.tree.heading('totalWordCount', text=_('With unused'))
-        self.tree.heading('totalWordCountDelta', text=_('Daily'))
-        self.tree.column('#0', width=0)
-        self.tree.column('date', anchor='center', width=self._plugin.kwargs['date_width'], stretch=False)
-        self.tree.column('wordCount', anchor='center', width=self._plugin.kwargs['wordcount_width'], stretch=False)
-        self.tree.column('wordCountDelta', anchor='center', width=self._plugin.kwargs['wordcount_delta_width'], stretch=False)
-        self.tree.column('totalWordCount', anchor='center', width=self._plugin.kwargs['totalcount_width'], stretch=False)
-        self.tree.column('totalWordCountDelta', anchor='center', width=self._plugin.kwargs['totalcount_delta_width'], stretch=False)
-
-        self.tree.tag_configure('positive', foreground='black')
-        self.tree.tag_configure('negative', foreground='red')
+        #--- Period selector.
+        self._period = self._plugin.kwargs['period']
+        if not self._period in PERIODS:
+            self._period = PERIODS[0]
+        optionsFrame = ttk.Frame(self)
+        optionsFrame.pack(fill='x')
+        self._periodSelector = ttk.Combobox(optionsFrame, values=ProgressList.PERIOD_TITLES, state='readonly', width=12)
+        self._periodSelector.current(PERIODS.index(self._period))
+        self._periodSelector.pack(side='left', padx=5, pady=5)
+        self._periodSelector.bind('<<ComboboxSelected>>', self._on_period_change)
+
+        #--- Date range.
+        self._startOrdinal = None
+        self._endOrdinal = None
+        # Ordinals of the first day and of the day after the displayed range, or None for no limit.
+        self._startDate = tk.StringVar(value='')
+        self._endDate = tk.StringVar(value='')
+        ttk.Label(optionsFrame, text=_('From')).pack(side='left', padx=5)
+        startEntry = ttk.Entry(optionsFrame, textvariable=self._startDate, width=11)
+        startEntry.pack(side='left')
+        ttk.Label(optionsFrame, text=_('To')).pack(side='left', padx=5)
+        endEntry = ttk.Entry(optionsFrame, textvariable=self._endDate, width=11)
+        endEntry.pack(side='left')
+        for entry in (startEntry, endEntry):
+            entry.bind('<Return>', self._on_range_change)
+            entry.bind('<FocusOut>', self._on_range_change)
+
+        #--- Statistics panel.
+        self._statisticsLabel = ttk.Label(self, anchor='w', justify='left')
+        self._statisticsLabel.pack(fill='x', padx=5, pady=5)
+
+        #--- Status line for timings.
+        if self._plugin.kwargs['show_timings']:
+            self._statusLine = ttk.Label(self, anchor='w')
+            self._statusLine.pack(side='bottom', fill='x', padx=5)
+        else:
+            self._statusLine = None
+
+        #--- Notebook with the log view and the chart.
+        self._notebook = ttk.Notebook(self)
+        self._notebook.pack(fill='both', expand=True)
+
+        #--- List for log view.
+        self._logList = ProgressList(self._notebook)
+        self._notebook.add(self._logList, text=_('Log'))
+        self._chart = ProgressChart(self._notebook)
+        self._notebook.add(self._chart, text=_('Chart'))
+        self.tree = self._logList.tree
+        self.tree.column('date', width=self._plugin.kwargs['date_width'])
+        self.tree.column('wordCount', width=self._plugin.kwargs['wordcount_width'])
+        self.tree.column('wordCountDelta', width=self._plugin.kwargs['wordcount_delta_width'])
+        self.tree.column('totalWordCount', width=self._plugin.kwargs['totalcount_width'])
+        self.tree.column('totalWordCountDelta', width=self._plugin.kwargs['totalcount_delta_width'])
+
+        #--- Word count log.
+        self.wcLogSeries = None
+        self._wcLogs = None
+        # Tuple (wcLog, wcLogUpdate) of the project logs the series is made of.
+        self._wcLogCopies = None
+        # Tuple of shallow copies of the project logs, for finding the entries changed since.
+        self._index = ProgressIndex(self._ui.prjFile.filePath)
+        self._indexedSceneCounts = None
+        # Scene counts loaded from the index, to be passed to the word counter.
+        self._unindexedSeries = None
+        # Merged log to be saved to the index after the next word count.
+        self._statistics = WcStatistics()
+        self._unindexedStatistics = None
+        # Statistics state referring to the merged log to be saved to the index.
+
+        #--- Background word count.
+        self._executor = None
+        # Worker thread pool, created with the first count.
+        self._countFuture = None
+        self._recountRequested = False
+
+        #--- Auto refresh.
+        self._projectSignal = (self._ui.isModified, self._ui.prjFile)
+        # Project state as seen at the last check; reading it needs no file access.
+        self._refreshId = None
+        if self._plugin.kwargs['auto_refresh']:
+            self.after(self._WATCH_INTERVAL, self._watch_project)
+
         self.isOpen = True
         self.build_tree()
 
     def build_tree(self):
-        self.reset_tree()
-        wcLog = {}
-
-        # Copy the read-in word count log.
-        for wcDate in self._ui.prjFile.wcLog:
-            wcLog[wcDate] = self._ui.prjFile.wcLog[wcDate]
-
-        # Add the word count determined when opening the project.
-        for wcDate in self._ui.prjFile.wcLogUpdate:
-            wcLog[wcDate] = self._ui.prjFile.wcLogUpdate[wcDate]
-
-        # Add the actual word count.
-        newCountInt, newTotalCountInt = self._ui.prjFile.count_words()
-        newCount = str(newCountInt)
-        newTotalCount = str(newTotalCountInt)
-        today = date.today().isoformat()
-        wcLog[today] = [newCount, newTotalCount]
-
-        lastCount = 0
-        lastTotalCount = 0
-        for wc in wcLog:
-            columns = []
-            nodeTags = ()
-            countInt = int(wcLog[wc][0])
-            countDiffInt = countInt - lastCount
-            totalCountInt = int(wcLog[wc][1])
-            totalCountDiffInt = totalCountInt - lastTotalCount
-            if countDiffInt == 0 and totalCountDiffInt == 0:
-                continue
+        """Build or refresh the log view.
 
-            if countDiffInt > 0:
-                nodeTags = ('positive')
+        Apply only the log entries changed since the last refresh to the series, and show them right away.
+        Update today's row when the word count running in the background is finished.
+        Rows that already exist in the tree are updated in place, if changed.
+        """
+        wcLogs = (self._ui.prjFile.wcLog, self._ui.prjFile.wcLogUpdate)
+        isNew = False
+        changedOrdinals = []
+        with timingLog.span('build_tree.merge'):
+            if self.wcLogSeries is None and self._index.read():
+                # The project file is unchanged since the index was saved.
+                self.wcLogSeries = self._index.wcLogSeries
+                self._indexedSceneCounts = self._index.sceneCounts
+                if self._index.statistics is not None:
+                    self._statistics.set_state(self._index.statistics)
+                isNew = True
+                # Apply the word count determined when opening the project, which is not saved yet.
+                changes = dict(self._ui.prjFile.wcLogUpdate)
             else:
-                nodeTags = ('negative')
-            columns = [
-                wc,
-                str(wcLog[wc][0]),
-                str(countDiffInt),
-                str(wcLog[wc][1]),
-                str(totalCountDiffInt),
-                ]
-            lastCount = countInt
-            lastTotalCount = totalCountInt
-            # startIndex = 'end'
-            # chronological order
-            startIndex = '0'
-            # reverse order
-            self.tree.insert('', startIndex, iid=wc, values=columns, tags=nodeTags, open=True)
+                changes = self._get_log_changes(wcLogs)
+                if changes is None:
+                    # Merge the read-in word count log and the word count determined when opening the project.
+                    self.wcLogSeries = WcLogSeries(*wcLogs)
+                    self._statistics = WcStatistics()
+                    # Days before the last one may have changed, which the statistics do not detect.
+                    isNew = True
+            for wcDate in sorted(changes or {}):
+                if self.wcLogSeries.set_day(wcDate, int(changes[wcDate][0]), int(changes[wcDate][1])):
+                    changedOrdinals.append(iso_to_ordinal(wcDate))
+            if changedOrdinals:
+                self._statistics.discard_from(min(changedOrdinals))
+            if isNew or changes:
+                self._wcLogs = wcLogs
+                self._wcLogCopies = tuple(dict(wcLog) for wcLog in wcLogs)
+            if self._indexedSceneCounts is None and (isNew or changes):
+                self._unindexedSeries = self.wcLogSeries.copy()
+                self._statistics.update(self._unindexedSeries)
+                self._unindexedStatistics = self._statistics.get_state()
+
+        # Update only the rows inserted into the tree; format and insert the others when scrolled into view.
+        with timingLog.span('build_tree.tree'):
+            if isNew:
+                self._logList.set_series(self.wcLogSeries, self._period, self._startOrdinal, self._endOrdinal)
+                self._chart.set_series(self.wcLogSeries)
+            elif changedOrdinals:
+                self._logList.update_series(min(changedOrdinals))
+                self._chart.update_series(min(changedOrdinals))
+            self._logList.refresh()
+        self._show_statistics()
+        self._start_count()
 
     def on_quit(self, event=None):
         self._plugin.kwargs['window_geometry'] = self.winfo_geometry()
@@ -112,11 +192,233 @@ class ProgressViewer(tk.Toplevel):
         self._plugin.kwargs['wordcount_delta_width'] = self.tree.column('wordCountDelta', 'width')
         self._plugin.kwargs['totalcount_width'] = self.tree.column('totalWordCount', 'width')
         self._plugin.kwargs['totalcount_delta_width'] = self.tree.column('totalWordCountDelta', 'width')
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
         self.destroy()
         self.isOpen = False
 
     def reset_tree(self):
         """Clear the displayed tree."""
-        for child in self.tree.get_children(''):
-            self.tree.delete(child)
+        with timingLog.span('reset_tree'):
+            self._logList.reset()
+
+    def _start_count(self):
+        """Count the words in a worker thread, and poll for the result.
+
+        Requests coming in while a count is running are coalesced into one recount.
+        """
+        if self._countFuture is not None:
+            self._recountRequested = True
+            return
+
+        if self._executor is None:
+            # Import the module not before it is needed, because this takes time.
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._countFuture = self._executor.submit(self._count_words, self._unindexedSeries, self._unindexedStatistics)
+        self._unindexedSeries = None
+        self._unindexedStatistics = None
+        self.after(self._POLL_INTERVAL, self._poll_count)
+
+    def _count_words(self, unindexedSeries, unindexedStatistics):
+        """Return a tuple of word count totals. Run in the worker thread.
+
+        Positional arguments:
+            unindexedSeries -- WcLogSeries instance to be saved to the index, or None.
+            unindexedStatistics -- dict: WcStatistics state referring to unindexedSeries.
+
+        Sum up the cached scene counts.
+        Fill the empty word counter with the scene counts from a valid index,
+        so that the scenes changed since are recognized.
+        """
+        wordCounter = self._plugin.wordCounter
+        if self._indexedSceneCounts is not None:
+            wordCounter.load(self._indexedSceneCounts)
+            self._indexedSceneCounts = None
+        with timingLog.span('build_tree.count'):
+            counts = wordCounter.count(self._ui.novel)
+        if unindexedSeries is not None:
+            self._index.write(unindexedSeries, wordCounter.dump(), unindexedStatistics)
+        return counts
+
+    def _poll_count(self):
+        """Add the actual word count to the log view when the background count is finished."""
+        if not self.isOpen:
+            return
+
+        if not self._countFuture.done():
+            self.after(self._POLL_INTERVAL, self._poll_count)
+            return
+
+        try:
+            newCountInt, newTotalCountInt = self._countFuture.result()
+        except:
+            # The novel may have been modified during the count; count again in the main thread.
+            newCountInt, newTotalCountInt = self._plugin.wordCounter.count(self._ui.novel)
+        self._countFuture = None
+        today = date.today()
+        if self.wcLogSeries.set_day(today.isoformat(), newCountInt, newTotalCountInt):
+            with timingLog.span('build_tree.tree'):
+                self._logList.update_series(today.toordinal())
+                self._logList.refresh()
+                self._chart.update_series(today.toordinal())
+            self._show_statistics()
+        self._show_timings()
+        if self._recountRequested:
+            self._recountRequested = False
+            self._start_count()
+
+    def _watch_project(self):
+        """Check for project changes at regular intervals, and schedule a refresh.
+
+        novelyst does not notify plugins of changes, but sets its modification flag
+        when the project is changed, and clears it when the project is saved.
+        Reading the flag and the project file reference costs next to nothing,
+        so the check does not access the file system or traverse the novel.
+        The refresh is debounced: While changes keep coming in, it is postponed.
+        """
+        if not self.isOpen:
+            return
+
+        projectSignal = (self._ui.isModified, self._ui.prjFile)
+        if projectSignal[0] != self._projectSignal[0] or projectSignal[1] is not self._projectSignal[1]:
+            self._projectSignal = projectSignal
+            self._schedule_refresh(self._REFRESH_DELAY)
+        self.after(self._WATCH_INTERVAL, self._watch_project)
+
+    def _schedule_refresh(self, delay):
+        """Schedule an automatic refresh, replacing a refresh already scheduled."""
+        if self._refreshId is not None:
+            self.after_cancel(self._refreshId)
+        self._refreshId = self.after(delay, self._auto_refresh)
+
+    def _auto_refresh(self):
+        """Update today's row, or refresh the whole view if the project's logs have changed.
+
+        Today's word count is determined in the worker thread, and the tree is
+        touched only if it has changed. The log entries of the other days change
+        only when the project is saved or reopened, which adds entries or replaces the logs.
+        While the project is modified, the edits are not signalled one by one,
+        so another refresh is scheduled.
+        """
+        self._refreshId = None
+        if not self.isOpen:
+            return
+
+        wcLogs = (self._ui.prjFile.wcLog, self._ui.prjFile.wcLogUpdate)
+        if any(wcLog is not oldLog or len(wcLog) != len(oldCopy) for wcLog, oldLog, oldCopy in zip(wcLogs, self._wcLogs, self._wcLogCopies)):
+            self.build_tree()
+        else:
+            self._start_count()
+        if self._ui.isModified:
+            self._schedule_refresh(self._RECOUNT_INTERVAL)
+
+    def _show_statistics(self):
+        """Update the statistics with the days added to the log, and display them."""
+        self._statistics.update(self.wcLogSeries)
+        statistics = self._statistics.get_statistics(date.today().toordinal(), self._get_word_target())
+        lines = [
+            f'{_("Current streak")}: {statistics["currentStreak"]} {_("days")}    '
+            f'{_("Longest streak")}: {statistics["longestStreak"]} {_("days")}',
+            f'{_("Average (7 days)")}: {statistics["average7"]:.0f}    '
+            f'{_("Average (30 days)")}: {statistics["average30"]:.0f}',
+            ]
+        if statistics['bestDay'] is not None:
+            lines.append(f'{_("Best day")}: {statistics["bestDay"]} (+{statistics["bestDayDelta"]})')
+        if statistics['forecast'] is not None:
+            lines.append(f'{_("Target reached")}: {statistics["forecast"]}')
+        self._statisticsLabel.configure(text='\n'.join(lines))
+
+    def _get_word_target(self):
+        """Return the target word count of the project, or of the settings if not set."""
+        for target in (getattr(self._ui.novel, 'wordTarget', None), self._plugin.kwargs['word_target']):
+            try:
+                target = int(target)
+            except:
+                continue
+
+            if target > 0:
+                return target
+
+        return 0
+
+    def _show_timings(self):
+        """Display the durations of the last refresh phases in the status line, if enabled."""
+        if self._statusLine is None:
+            return
+
+        timings = []
+        for name, title in self._TIMED_PHASES:
+            duration = timingLog.get_last(name)
+            if duration is not None:
+                timings.append(f'{title} {duration * 1000:.1f} ms')
+        self._statusLine.configure(text=' | '.join(timings))
+
+    def _on_period_change(self, event=None):
+        """Show the log aggregated by the selected period."""
+        self._period = PERIODS[self._periodSelector.current()]
+        self._plugin.kwargs['period'] = self._period
+        self.reset_tree()
+        self._logList.set_series(self.wcLogSeries, self._period, self._startOrdinal, self._endOrdinal)
+        self._logList.refresh()
+
+    def _on_range_change(self, event=None):
+        """Show the log limited to the dates entered.
+
+        Empty fields mean no limit. Invalid dates are replaced by the previous entry.
+        """
+        startOrdinal = self._get_ordinal(self._startDate.get(), self._startOrdinal)
+        endOrdinal = self._get_ordinal(self._endDate.get(), self._endOrdinal, 1)
+        if startOrdinal is None:
+            self._startDate.set('')
+        else:
+            self._startDate.set(ordinal_to_iso(startOrdinal))
+        if endOrdinal is None:
+            self._endDate.set('')
+        else:
+            self._endDate.set(ordinal_to_iso(endOrdinal - 1))
+        if (startOrdinal, endOrdinal) == (self._startOrdinal, self._endOrdinal):
+            return
+
+        self._startOrdinal = startOrdinal
+        self._endOrdinal = endOrdinal
+        self.reset_tree()
+        self._logList.set_series(self.wcLogSeries, self._period, self._startOrdinal, self._endOrdinal)
+        self._logList.refresh()
+
+    def _get_ordinal(self, isoDate, default, offset=0):
+        """Return the ordinal of an ISO date plus offset, None if empty, or default if invalid."""
+        isoDate = isoDate.strip()
+        if not isoDate:
+            return None
+
+        try:
+            return iso_to_ordinal(isoDate) + offset
+        except:
+            return default
+
+    def _get_log_changes(self, wcLogs):
+        """Return a dictionary of the log entries added or changed since the last refresh, or None.
+
+        Positional arguments:
+            wcLogs -- tuple (wcLog, wcLogUpdate) of the project's logs.
+
+        The logs are compared with the copies taken at the last refresh.
+        Return None if the series has to be rebuilt, because the logs were replaced,
+        or entries were removed.
+        """
+        if self._wcLogs is None or any(wcLog is not oldLog for wcLog, oldLog in zip(wcLogs, self._wcLogs)):
+            return None
+
+        if wcLogs == self._wcLogCopies:
+            return {}
+
+        merged = {}
+        oldMerged = {}
+        for wcLog, oldLog in zip(wcLogs, self._wcLogCopies):
+            merged.update(wcLog)
+            oldMerged.update(oldLog)
+        if not oldMerged.keys() <= merged.keys():
+            return None
 
+        return {wcDate: entry for wcDate, entry in merged.items() if oldMerged.get(wcDate) != entry}
@@ -0,0 +1,108 @@
+"""Provide a class for timing the plugin's hot paths.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class TimingLog:
+    """Bounded record of the durations of instrumented operations.
+
+    All methods are thread-safe, so durations can be recorded 
+    by worker threads while the Tk thread reads them.
+
+    Public methods:
+        span(name) -- Context manager measuring the duration of a block.
+        add(name, duration) -- Record a duration.
+        get_timings(count=None) -- Return the most recent timings.
+        get_last(name) -- Return the most recent duration of an operation.
+        enable_file_log(filePath) -- Write the timings to a rotating log file.
+        disable_file_log() -- Stop writing the timings to a log file.
+    """
+    MAX_ENTRIES = 1000
+
+    def __init__(self):
+        self._timings = deque(maxlen=self.MAX_ENTRIES)
+        # Entries: (name, start time as time.time() value, duration in seconds).
+        self._lock = threading.Lock()
+        # Guards _timings.
+        self._logger = logging.getLogger('novelyst_progress.timing')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._handler = None
+
+    @contextmanager
+    def span(self, name):
+        """Measure the duration of the enclosed block, and record it under name."""
+        startTime = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - startTime)
+
+    def add(self, name, duration):
+        """Record a duration in seconds under name."""
+        with self._lock:
+            self._timings.append((name, time.time() - duration, duration))
+        if self._handler is not None:
+            self._logger.info('%s %.3f ms', name, duration * 1000)
+
+    def get_timings(self, count=None):
+        """Return a list of the most recent (name, start time, duration) tuples, the latest last.
+
+        Optional arguments:
+            count: int -- maximum number of entries. Default: all recorded entries.
+        """
+        with self._lock:
+            timings = list(self._timings)
+        if count is not None:
+            timings = timings[-count:]
+        return timings
+
+    def get_last(self, name):
+        """Return the most recent duration in seconds recorded under name, or None."""
+        with self._lock:
+            for timingName, startTime, duration in reversed(self._timings):
+                if timingName == name:
+                    return duration
+
+        return None
+
+    def enable_file_log(self, filePath, maxBytes=100000, backupCount=2):
+        """Write the timings to a rotating log file.
+
+        Positional arguments:
+            filePath: str -- path to the log file.
+
+        Optional arguments:
+            maxBytes: int -- file size that triggers the rotation.
+            backupCount: int -- number of rotated files to keep.
+        """
+        # Import the module not before it is needed, because this takes time.
+        import logging.handlers
+        self.disable_file_log()
+        try:
+            self._handler = logging.handlers.RotatingFileHandler(filePath, maxBytes=maxBytes, backupCount=backupCount, encoding='utf-8')
+        except:
+            self._handler = None
+            return
+
+        self._handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        self._logger.addHandler(self._handler)
+
+    def disable_file_log(self):
+        """Stop writing the timings to a log file."""
+        if self._handler is not None:
+            self._logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+
+timingLog = TimingLog()
+# Timing record shared by all modules of the plugin.
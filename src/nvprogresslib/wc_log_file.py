@@ -0,0 +1,172 @@
+"""Provide a base class for word count log export files.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import tempfile
+from urllib.parse import quote
+from pywriter.pywriter_globals import *
+from nvprogresslib.timing_log import timingLog
+from nvprogresslib.wc_log_series import iso_to_ordinal
+
+
+class WcLogFile:
+    """Abstract word count log export file.
+    
+    All export formats share one row pipeline, see _get_rows(). 
+    The rows are generated one by one and written in chunks, 
+    so the memory needed does not grow with the log length.
+
+    Public methods:
+        write() -- Write the word count log to the export file.
+    """
+    DESCRIPTION = 'Word count log'
+    EXTENSION = None
+    SUFFIX = '_wordcount_log'
+
+    _CHUNK_SIZE = 500
+    # Number of lines to write at a time.
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize instance variables.
+
+        Positional arguments:
+            filePath: str -- path to the file represented by the File instance.
+            
+        Optional arguments:
+            period: str -- aggregation period, one of PERIODS. Default: 'day'.
+            start_date: str -- ISO date of the first day to export. Default: no limit.
+            end_date: str -- ISO date of the last day to export. Default: no limit.
+            kwargs -- keyword arguments to be used by subclasses.  
+        """
+        self.novel = None
+
+        self.wcLogSeries = None
+        # WcLogSeries instance holding the word count log to export.
+
+        self.period = kwargs.get('period', 'day')
+        # str -- aggregation period of the exported rows.
+
+        self.startDate = kwargs.get('start_date', None)
+        self.endDate = kwargs.get('end_date', None)
+        # str -- ISO dates limiting the exported days, or None.
+
+        self._filePath = None
+        # str
+        # Path to the file. The setter only accepts files of a supported type as specified by EXTENSION.
+
+        self.projectName = None
+        # str
+        # URL-coded file name without suffix and extension.
+
+        self.projectPath = None
+        # str
+        # URL-coded path to the project directory.
+
+        self.filePath = filePath
+
+    @property
+    def filePath(self):
+        return self._filePath
+
+    @filePath.setter
+    def filePath(self, filePath):
+        """Setter for the filePath instance variable.
+                
+        - Format the path string according to Python's requirements. 
+        - Accept only filenames with the right suffix and extension.
+        """
+        if self.SUFFIX is not None:
+            suffix = self.SUFFIX
+        else:
+            suffix = ''
+        if filePath.lower().endswith(f'{suffix}{self.EXTENSION}'.lower()):
+            self._filePath = filePath
+            try:
+                head, tail = os.path.split(os.path.realpath(filePath))
+                # realpath() completes relative paths, but may not work on virtual file systems.
+            except:
+                head, tail = os.path.split(filePath)
+            self.projectPath = quote(head.replace('\\', '/'), '/:')
+            self.projectName = quote(tail.replace(f'{suffix}{self.EXTENSION}', ''))
+
+    def write(self):
+        """Write instance variables to the export file.
+        
+        Stream the content to a temporary file in the same directory,
+        and then replace the export file in one atomic step. 
+        Thus, a failure never leaves a half-written file.
+        Raise the "Error" exception in case of error. 
+        """
+        with timingLog.span(f'{self.__class__.__name__}.write'):
+            self._write_file()
+
+    def _write_file(self):
+        """Stream the content to a temporary file, and replace the export file."""
+        dirPath = os.path.dirname(os.path.abspath(self.filePath))
+        try:
+            fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=dirPath)
+        except:
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self._write_content(f)
+            os.chmod(tempPath, 0o644)
+            # mkstemp() creates files only readable by the owner.
+            os.replace(tempPath, self.filePath)
+        except:
+            try:
+                os.remove(tempPath)
+            except:
+                pass
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
+    def _write_content(self, f):
+        """Write the lines in UTF-8 encoded chunks to a binary file object.
+        
+        This is a template method that can be overridden by subclasses.
+        """
+        chunk = []
+        for line in self._get_lines():
+            chunk.append(line)
+            if len(chunk) >= self._CHUNK_SIZE:
+                f.write(''.join(chunk).encode('utf-8'))
+                chunk = []
+        f.write(''.join(chunk).encode('utf-8'))
+
+    def _get_rows(self):
+        """Generate (date, count, count delta, total count, total count delta) tuples in chronological order.
+        
+        This is the row pipeline shared by all export formats. 
+        Date is the ISO date, or the period key if aggregated.
+        """
+        startOrdinal, endOrdinal = self._get_range()
+        return self.wcLogSeries.period_rows(self.period, False, startOrdinal, endOrdinal)
+
+    def _get_range(self):
+        """Return a tuple (ordinal of the first day, ordinal of the day after the last day) to export.
+
+        None means no limit.
+        """
+        startOrdinal = None
+        endOrdinal = None
+        if self.startDate:
+            startOrdinal = iso_to_ordinal(self.startDate)
+        if self.endDate:
+            endOrdinal = iso_to_ordinal(self.endDate) + 1
+        return startOrdinal, endOrdinal
+
+    def _get_lines(self):
+        """Generate the lines to be written to the output file.
+        
+        This is a template method that must be overridden by subclasses.
+        """
+        raise NotImplementedError
+
+    def _get_text(self):
+        """Return a string to be written to the output file."""
+        with timingLog.span(f'{self.__class__.__name__}._get_text'):
+            return ''.join(self._get_lines())
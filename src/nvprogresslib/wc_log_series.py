@@ -0,0 +1,410 @@
+"""Provide a class for a compact daily word count series.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from bisect import bisect_left
+from datetime import date
+from itertools import chain
+from operator import sub
+
+TYPECODE = 'i'
+# Typecode of the series arrays (signed int, 4 bytes).
+
+PERIODS = ('day', 'week', 'month', 'year')
+# Aggregation periods.
+
+_numpy = None
+# numpy module, imported on first use; False if not available.
+
+
+def get_numpy():
+    """Return the numpy module, or None if not available.
+
+    Import numpy not before it is needed, because this takes time.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def iso_to_ordinal(isoDate):
+    """Return the proleptic Gregorian ordinal of an ISO date string 'YYYY-MM-DD'."""
+    return date(int(isoDate[:4]), int(isoDate[5:7]), int(isoDate[8:10])).toordinal()
+
+
+def ordinal_to_iso(ordinal):
+    """Return the ISO date string 'YYYY-MM-DD' of a proleptic Gregorian ordinal."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+def get_period(ordinal, period):
+    """Return a tuple (key, start ordinal of the next period) for the period containing a day.
+
+    Positional arguments:
+        ordinal: int -- proleptic Gregorian ordinal of the day.
+        period: str -- one of PERIODS.
+
+    The key is an ISO string such as '2023-05-17', '2023-W20', '2023-05', or '2023'.
+    """
+    day = date.fromordinal(ordinal)
+    if period == 'week':
+        isoYear, isoWeek, isoWeekday = day.isocalendar()
+        return f'{isoYear}-W{isoWeek:02}', ordinal - isoWeekday + 8
+
+    if period == 'month':
+        if day.month == 12:
+            nextStart = date(day.year + 1, 1, 1)
+        else:
+            nextStart = date(day.year, day.month + 1, 1)
+        return f'{day.year}-{day.month:02}', nextStart.toordinal()
+
+    if period == 'year':
+        return str(day.year), date(day.year + 1, 1, 1).toordinal()
+
+    return day.isoformat(), ordinal + 1
+
+
+def get_period_start(ordinal, period):
+    """Return the ordinal of the first day of the period containing a day.
+
+    Positional arguments:
+        ordinal: int -- proleptic Gregorian ordinal of the day.
+        period: str -- one of PERIODS.
+    """
+    day = date.fromordinal(ordinal)
+    if period == 'week':
+        return ordinal - day.isoweekday() + 1
+
+    if period == 'month':
+        return date(day.year, day.month, 1).toordinal()
+
+    if period == 'year':
+        return date(day.year, 1, 1).toordinal()
+
+    return ordinal
+
+
+class WcLogSeries:
+    """Daily word count series, stored in typed arrays.
+
+    The word count log entries are parsed once.
+    Daily differences and the indices of the days with changed word counts
+    are calculated in one pass, using numpy if available.
+
+    Since the word counts are the cumulative sums of the daily differences,
+    the difference over any range of days is looked up directly,
+    without adding up the days in between.
+
+    Public methods:
+        from_arrays(ordinals, counts, totalCounts) -- Class method: Return a series made of arrays.
+        copy() -- Return a copy of the series.
+        set_day(isoDate, count, totalCount) -- Add or replace a day's word counts; return True if changed.
+        range_deltas(startOrdinal, endOrdinal) -- Return the word count differences over a range of days.
+        index_range(startOrdinal=None, endOrdinal=None) -- Return the array index range of a range of days.
+        changed_range(start, end) -- Return the positions in changed of an array index range.
+        rows(reverse=False, startOrdinal=None, endOrdinal=None) -- Iterate over the days with changed word counts.
+        get_row(i) -- Return the row of the day at an array index.
+        period_rows(period, reverse=False, startOrdinal=None, endOrdinal=None) -- Iterate over the periods with changed word counts.
+        period_ends(period, start=0, end=None) -- Return the array index ends of the periods with changed word counts.
+        get_period_row(period, start, end) -- Return the row of the days within an array index range.
+
+    Public instance variables:
+        ordinals -- array of day ordinals, in ascending order.
+        counts -- array of word counts.
+        totalCounts -- array of word counts including unused scenes.
+        countDeltas -- array of word count differences to the previous day.
+        totalCountDeltas -- array of total word count differences to the previous day.
+        changed -- array of the indices of the days with word count changes.
+    """
+
+    def __init__(self, *wcLogs):
+        """Merge word count logs into the series.
+
+        Optional arguments:
+            wcLogs -- dictionaries: key = ISO date string, value = [count, totalCount].
+
+        Entries of later logs replace entries of earlier logs with the same date.
+        """
+        merged = {}
+        for wcLog in wcLogs:
+            merged.update(wcLog)
+        wcDates = sorted(merged)
+        self.ordinals = array(TYPECODE, [iso_to_ordinal(wcDate) for wcDate in wcDates])
+        self.counts = array(TYPECODE, [int(merged[wcDate][0]) for wcDate in wcDates])
+        self.totalCounts = array(TYPECODE, [int(merged[wcDate][1]) for wcDate in wcDates])
+        self._compute()
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    @classmethod
+    def from_arrays(cls, ordinals, counts, totalCounts):
+        """Return a series made of arrays of equal length.
+
+        Positional arguments:
+            ordinals -- array of day ordinals, in ascending order.
+            counts -- array of word counts.
+            totalCounts -- array of word counts including unused scenes.
+        """
+        series = cls()
+        series.ordinals = ordinals
+        series.counts = counts
+        series.totalCounts = totalCounts
+        series._compute()
+        return series
+
+    def copy(self):
+        """Return a copy of the series."""
+        return WcLogSeries.from_arrays(array(TYPECODE, self.ordinals), array(TYPECODE, self.counts), array(TYPECODE, self.totalCounts))
+
+    def set_day(self, isoDate, count, totalCount):
+        """Add or replace a day's word counts.
+
+        Positional arguments:
+            isoDate: str -- ISO date string.
+            count: int -- word count.
+            totalCount: int -- word count including unused scenes.
+
+        Return True if the series has changed.
+        Only the differences of the day and the next day are updated,
+        unless the day is inserted before the last day, which requires
+        the changed days to be recalculated.
+        """
+        ordinal = iso_to_ordinal(isoDate)
+        i = bisect_left(self.ordinals, ordinal)
+        if i < len(self.ordinals) and self.ordinals[i] == ordinal:
+            if self.counts[i] == count and self.totalCounts[i] == totalCount:
+                return False
+
+            self.counts[i] = count
+            self.totalCounts[i] = totalCount
+        elif i == len(self.ordinals):
+            self.ordinals.append(ordinal)
+            self.counts.append(count)
+            self.totalCounts.append(totalCount)
+            self.countDeltas.append(0)
+            self.totalCountDeltas.append(0)
+        else:
+            self.ordinals.insert(i, ordinal)
+            self.counts.insert(i, count)
+            self.totalCounts.insert(i, totalCount)
+            self._compute()
+            return True
+
+        self._update_day(i)
+        if i + 1 < len(self.ordinals):
+            self._update_day(i + 1)
+        return True
+
+    def range_deltas(self, startOrdinal, endOrdinal):
+        """Return a tuple of word count differences over a range of days.
+
+        Positional arguments:
+            startOrdinal: int -- ordinal of the first day of the range.
+            endOrdinal: int -- ordinal of the day after the range.
+
+        countDelta: int -- word count difference.
+        totalCountDelta: int -- difference of the word count including unused scenes.
+        """
+        start = bisect_left(self.ordinals, startOrdinal)
+        end = bisect_left(self.ordinals, endOrdinal, start)
+        return self._counts_before(end, 0) - self._counts_before(start, 0), \
+            self._counts_before(end, 1) - self._counts_before(start, 1)
+
+    def index_range(self, startOrdinal=None, endOrdinal=None):
+        """Return a tuple (start, end) of the array indices of a range of days.
+
+        Optional arguments:
+            startOrdinal: int -- ordinal of the first day of the range. Default: no limit.
+            endOrdinal: int -- ordinal of the day after the range. Default: no limit.
+
+        The days are found by binary search on the ordinals.
+        """
+        if startOrdinal is None:
+            start = 0
+        else:
+            start = bisect_left(self.ordinals, startOrdinal)
+        if endOrdinal is None:
+            end = len(self.ordinals)
+        else:
+            end = max(bisect_left(self.ordinals, endOrdinal), start)
+        return start, end
+
+    def changed_range(self, start, end):
+        """Return a tuple (lo, hi) of the positions in changed of the days within an array index range.
+
+        Positional arguments:
+            start: int -- array index of the first day.
+            end: int -- array index after the last day.
+        """
+        lo = bisect_left(self.changed, start)
+        return lo, bisect_left(self.changed, end, lo)
+
+    def rows(self, reverse=False, startOrdinal=None, endOrdinal=None):
+        """Iterate over the days with word count changes.
+
+        Optional arguments:
+            reverse: bool -- if True, start with the most recent day.
+            startOrdinal: int -- ordinal of the first day. Default: no limit.
+            endOrdinal: int -- ordinal of the day after the last day. Default: no limit.
+
+        Yield tuples: (ISO date string, count, countDelta, totalCount, totalCountDelta).
+        Only the days within the range are visited.
+        """
+        lo, hi = self.changed_range(*self.index_range(startOrdinal, endOrdinal))
+        if reverse:
+            positions = range(hi - 1, lo - 1, -1)
+        else:
+            positions = range(lo, hi)
+        for k in positions:
+            yield self.get_row(self.changed[k])
+
+    def get_row(self, i):
+        """Return a tuple (ISO date string, count, countDelta, totalCount, totalCountDelta) of the day at index i."""
+        return (
+            ordinal_to_iso(self.ordinals[i]),
+            self.counts[i],
+            self.countDeltas[i],
+            self.totalCounts[i],
+            self.totalCountDeltas[i],
+            )
+
+    def period_rows(self, period, reverse=False, startOrdinal=None, endOrdinal=None):
+        """Iterate over the periods with word count changes.
+
+        Positional arguments:
+            period: str -- one of PERIODS.
+
+        Optional arguments:
+            reverse: bool -- if True, start with the most recent period.
+            startOrdinal: int -- ordinal of the first day. Default: no limit.
+            endOrdinal: int -- ordinal of the day after the last day. Default: no limit.
+
+        Yield tuples: (period key, count, countDelta, totalCount, totalCountDelta),
+        where the counts are taken at the end of the period.
+        With a range, the first and the last period are cut at the range limits.
+        """
+        if period == 'day':
+            yield from self.rows(reverse, startOrdinal, endOrdinal)
+            return
+
+        rangeStart, rangeEnd = self.index_range(startOrdinal, endOrdinal)
+        ends = self.period_ends(period, rangeStart, rangeEnd)
+        if reverse:
+            positions = range(len(ends) - 1, -1, -1)
+        else:
+            positions = range(len(ends))
+        for r in positions:
+            if r:
+                start = ends[r - 1]
+            else:
+                start = rangeStart
+            yield self.get_period_row(period, start, ends[r])
+
+    def period_ends(self, period, start=0, end=None):
+        """Return an array of the index ends of the periods with word count changes.
+
+        Positional arguments:
+            period: str -- one of PERIODS.
+
+        Optional arguments:
+            start: int -- array index of the first day of the first period. Default: the first day.
+            end: int -- array index after the last day of the last period. Default: after the last day.
+
+        Each period ends before the array index returned for it, and starts at the end
+        of the period before, because the periods without changes in between carry the counts over.
+        Jump from period to period by binary search, so the cost depends
+        on the number of periods, not on the number of days.
+        """
+        ends = array(TYPECODE)
+        i = start
+        if end is None:
+            end = len(self.ordinals)
+        lastCount = self._counts_before(i, 0)
+        lastTotalCount = self._counts_before(i, 1)
+        while i < end:
+            __, nextStart = get_period(self.ordinals[i], period)
+            i = bisect_left(self.ordinals, nextStart, i, end)
+            count = self.counts[i - 1]
+            totalCount = self.totalCounts[i - 1]
+            if count != lastCount or totalCount != lastTotalCount:
+                ends.append(i)
+            lastCount = count
+            lastTotalCount = totalCount
+        return ends
+
+    def get_period_row(self, period, start, end):
+        """Return a tuple (period key, count, countDelta, totalCount, totalCountDelta) of the days within an index range.
+
+        Positional arguments:
+            period: str -- one of PERIODS.
+            start: int -- array index of the first day.
+            end: int -- array index after the last day.
+
+        The counts are taken at the last day, and the differences refer to the day before the first day.
+        """
+        i = end - 1
+        count = self.counts[i]
+        totalCount = self.totalCounts[i]
+        return (
+            get_period(self.ordinals[i], period)[0],
+            count,
+            count - self._counts_before(start, 0),
+            totalCount,
+            totalCount - self._counts_before(start, 1),
+            )
+
+    def _counts_before(self, i, column):
+        """Return the word count of the day before index i; column 0 = count, 1 = total count."""
+        if i == 0:
+            return 0
+
+        if column == 0:
+            return self.counts[i - 1]
+
+        return self.totalCounts[i - 1]
+
+    def _update_day(self, i):
+        """Update the differences of the day at index i, and whether it is one of the changed days."""
+        countDelta = self.counts[i] - self._counts_before(i, 0)
+        totalCountDelta = self.totalCounts[i] - self._counts_before(i, 1)
+        self.countDeltas[i] = countDelta
+        self.totalCountDeltas[i] = totalCountDelta
+        j = bisect_left(self.changed, i)
+        isChanged = j < len(self.changed) and self.changed[j] == i
+        if countDelta != 0 or totalCountDelta != 0:
+            if not isChanged:
+                self.changed.insert(j, i)
+        elif isChanged:
+            del self.changed[j]
+
+    def _compute(self):
+        """Calculate the daily differences and find the days with word count changes.
+
+        A day's difference refers to the previous day, which is the same as the
+        previous day with word count changes, because unchanged days carry the counts over.
+        """
+        np = get_numpy()
+        if np is not None:
+            counts = np.frombuffer(self.counts, dtype=np.intc)
+            totalCounts = np.frombuffer(self.totalCounts, dtype=np.intc)
+            countDeltas = np.diff(counts, prepend=0).astype(np.intc)
+            totalCountDeltas = np.diff(totalCounts, prepend=0).astype(np.intc)
+            changed = np.flatnonzero((countDeltas != 0) | (totalCountDeltas != 0)).astype(np.intc)
+            self.countDeltas = array(TYPECODE, countDeltas.tobytes())
+            self.totalCountDeltas = array(TYPECODE, totalCountDeltas.tobytes())
+            self.changed = array(TYPECODE, changed.tobytes())
+        else:
+            self.countDeltas = array(TYPECODE, map(sub, self.counts, chain((0,), self.counts)))
+            self.totalCountDeltas = array(TYPECODE, map(sub, self.totalCounts, chain((0,), self.totalCounts)))
+            self.changed = array(TYPECODE, [
+                i for i, deltas in enumerate(zip(self.countDeltas, self.totalCountDeltas)) if deltas != (0, 0)
+                ])
@@ -0,0 +1,191 @@
+"""Provide a class for incrementally maintained writing statistics.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import copy
+from collections import deque
+from nvprogresslib.wc_log_series import ordinal_to_iso
+
+
+class WcStatistics:
+    """Writing statistics, maintained with constant work per new log day.
+
+    The statistics refer to the word count of "normal" scenes.
+    A writing day is a day with a word count increase.
+    Days not logged are days without writing.
+
+    All days of a series but the last are committed to the state.
+    The last day, usually today, may still change; it is evaluated on a copy
+    of the state when the statistics are requested.
+    If the last committed day changed in the series, e.g. because the
+    project's log was replaced, the state is rebuilt from scratch.
+    Changes of earlier days are not detected, so the caller discards the state.
+
+    Public methods:
+        update(wcLogSeries) -- Commit the days added to the series since the last update.
+        discard_from(ordinal) -- Discard the state if a changed day is committed.
+        get_statistics(todayOrdinal, target=0) -- Return a dictionary with the statistics.
+        get_state() -- Return the state as a JSON serializable dictionary.
+        set_state(state) -- Restore the state.
+    """
+    WINDOWS = (7, 30)
+    # Days of the rolling averages.
+
+    def __init__(self):
+        self._reset()
+        self._pending = None
+        # (ordinal, count) of the last day, not committed.
+
+    def update(self, wcLogSeries):
+        """Commit the days added to the series since the last update.
+
+        Positional arguments:
+            wcLogSeries -- WcLogSeries instance.
+        """
+        days = len(wcLogSeries)
+        if self._days:
+            if (self._days >= days
+                    or wcLogSeries.ordinals[self._days - 1] != self._lastOrdinal
+                    or wcLogSeries.counts[self._days - 1] != self._lastCount):
+                self._reset()
+        for i in range(self._days, days - 1):
+            self._add(wcLogSeries.ordinals[i], wcLogSeries.counts[i])
+        if days:
+            self._pending = (wcLogSeries.ordinals[days - 1], wcLogSeries.counts[days - 1])
+        else:
+            self._pending = None
+
+    def discard_from(self, ordinal):
+        """Discard the committed state if it includes a changed day.
+
+        Positional arguments:
+            ordinal: int -- ordinal of the earliest day changed in the series.
+        """
+        if self._lastOrdinal is not None and ordinal <= self._lastOrdinal:
+            self._reset()
+
+    def get_statistics(self, todayOrdinal, target=0):
+        """Return a dictionary with the statistics.
+
+        Positional arguments:
+            todayOrdinal: int -- ordinal of the day the statistics refer to.
+
+        Optional arguments:
+            target: int -- target word count for the completion forecast.
+
+        Keys:
+            count: int -- actual word count.
+            currentStreak: int -- number of consecutive writing days up to today or yesterday.
+            longestStreak: int -- maximum number of consecutive writing days.
+            bestDay: str -- ISO date of the day with the highest increase, or None.
+            bestDayDelta: int -- highest increase.
+            average7, average30: float -- average daily word count change over the last 7/30 days.
+            forecast: str -- ISO date when the target is reached, or None if not predictable.
+        """
+        state = self
+        if self._pending is not None:
+            state = copy.copy(self)
+            state._recent = deque(self._recent)
+            state._add(*self._pending)
+        statistics = dict(
+            count=state._lastCount,
+            longestStreak=state._longestStreak,
+            bestDayDelta=state._bestDelta,
+            )
+        if state._streakEnd is not None and state._streakEnd >= todayOrdinal - 1:
+            statistics['currentStreak'] = state._streak
+        else:
+            statistics['currentStreak'] = 0
+        if state._bestOrdinal is not None:
+            statistics['bestDay'] = ordinal_to_iso(state._bestOrdinal)
+        else:
+            statistics['bestDay'] = None
+        for window in self.WINDOWS:
+            total = 0
+            for ordinal, delta in state._recent:
+                if todayOrdinal - window < ordinal <= todayOrdinal:
+                    total += delta
+            statistics[f'average{window}'] = total / window
+        rate = statistics[f'average{self.WINDOWS[-1]}']
+        remaining = target - state._lastCount
+        if target <= 0:
+            statistics['forecast'] = None
+        elif remaining <= 0:
+            statistics['forecast'] = ordinal_to_iso(todayOrdinal)
+        elif rate > 0:
+            days = int(remaining / rate + 0.999999)
+            statistics['forecast'] = ordinal_to_iso(todayOrdinal + days)
+        else:
+            statistics['forecast'] = None
+        return statistics
+
+    def get_state(self):
+        """Return the committed state as a JSON serializable dictionary."""
+        return dict(
+            days=self._days,
+            lastOrdinal=self._lastOrdinal,
+            lastCount=self._lastCount,
+            streak=self._streak,
+            streakEnd=self._streakEnd,
+            longestStreak=self._longestStreak,
+            bestOrdinal=self._bestOrdinal,
+            bestDelta=self._bestDelta,
+            recent=list(self._recent),
+            )
+
+    def set_state(self, state):
+        """Restore the committed state from a dictionary returned by get_state()."""
+        try:
+            self._days = state['days']
+            self._lastOrdinal = state['lastOrdinal']
+            self._lastCount = state['lastCount']
+            self._streak = state['streak']
+            self._streakEnd = state['streakEnd']
+            self._longestStreak = state['longestStreak']
+            self._bestOrdinal = state['bestOrdinal']
+            self._bestDelta = state['bestDelta']
+            self._recent = deque(tuple(entry) for entry in state['recent'])
+        except (KeyError, TypeError):
+            self._reset()
+
+    def _add(self, ordinal, count):
+        """Commit a day to the state.
+
+        The first day of the log is the baseline, not a writing day.
+        """
+        if self._lastOrdinal is None:
+            delta = 0
+        else:
+            delta = count - self._lastCount
+        if delta > 0:
+            if self._streakEnd is not None and ordinal == self._streakEnd + 1:
+                self._streak += 1
+            else:
+                self._streak = 1
+            self._streakEnd = ordinal
+            if self._streak > self._longestStreak:
+                self._longestStreak = self._streak
+            if delta > self._bestDelta:
+                self._bestDelta = delta
+                self._bestOrdinal = ordinal
+        self._recent.append((ordinal, delta))
+        while self._recent[0][0] <= ordinal - self.WINDOWS[-1]:
+            self._recent.popleft()
+        self._lastOrdinal = ordinal
+        self._lastCount = count
+        self._days += 1
+
+    def _reset(self):
+        """Discard the committed state."""
+        self._days = 0
+        self._lastOrdinal = None
+        self._lastCount = 0
+        self._streak = 0
+        self._streakEnd = None
+        self._longestStreak = 0
+        self._bestOrdinal = None
+        self._bestDelta = 0
+        self._recent = deque()
+        # (ordinal, delta) tuples of the days within the longest window.
@@ -0,0 +1,101 @@
+"""Provide a class for incremental, per-scene memoized word counting.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+
+
+class WordCounter:
+    """Word counter with a per-scene cache.
+
+    The novel model counts a scene's words and letters whenever
+    its content is set, so the totals are summed up from these counts,
+    without processing any text.
+    Each scene's counts are cached under its ID, so that the scenes
+    modified since the last count are recognized by their changed counts.
+
+    Public methods:
+        count(novel) -- Return a tuple of word count totals.
+        clear() -- Discard the cache and reset the counters.
+        dump() -- Return the cached scene counts for persistence.
+        load(sceneCounts) -- Fill the empty cache with persisted scene counts.
+
+    Public instance variables:
+        hits: int -- Number of scenes found unchanged in the cache.
+        misses: int -- Number of scenes new or changed since the last count.
+        sceneCounts -- dict: key = scene ID, value = word count.
+    """
+
+    def __init__(self):
+        """Initialize the cache and the counters."""
+        self._cache = {}
+        # key: str -- scene ID
+        # value: tuple -- (word count, letter count)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def sceneCounts(self):
+        return {scId: self._cache[scId][0] for scId in self._cache}
+
+    def clear(self):
+        """Discard the cache and reset the counters."""
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def dump(self):
+        """Return the cached scene counts for persistence.
+
+        Return a dictionary: key = scene ID, value = (word count, letter count).
+        """
+        return dict(self._cache)
+
+    def load(self, sceneCounts):
+        """Fill the empty cache with persisted scene counts.
+
+        Positional arguments:
+            sceneCounts -- dictionary: key = scene ID, value = (word count, letter count).
+
+        Thus, the next count tells the scenes changed since the counts were persisted.
+        A cache that is already filled is kept, because it is more recent.
+        """
+        if not self._cache:
+            self._cache = dict(sceneCounts)
+
+    def count(self, novel):
+        """Return a tuple of word count totals.
+
+        Positional arguments:
+            novel -- Novel instance to count.
+
+        count: int -- Total words of "normal" type scenes.
+        totalCount: int -- Total words of "normal" and "unused" scenes.
+
+        Traverse the novel the same way as the project file's count_words() method.
+        Scenes that are no longer part of the novel are dropped from the cache.
+        """
+        count = 0
+        totalCount = 0
+        cache = {}
+        for chId in novel.srtChapters:
+            if novel.chapters[chId].isTrash:
+                continue
+
+            for scId in novel.chapters[chId].srtScenes:
+                scene = novel.scenes[scId]
+                if scene.scType > 1:
+                    continue
+
+                counts = (scene.wordCount, scene.letterCount)
+                if self._cache.get(scId) == counts:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                cache[scId] = counts
+                totalCount += counts[0]
+                if scene.scType == 0:
+                    count += counts[0]
+        self._cache = cache
+        return count, totalCount
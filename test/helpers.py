@@ -0,0 +1,365 @@
+"""Provide stand-ins and reference computations for the novelyst_progress tests.
+
+The reference computations walk through a word count log day by day,
+so that they can serve as a simple and obviously correct model of the
+optimized code under test.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import random
+import sys
+import types
+from datetime import date
+
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../../PyWriter/src')
+
+
+#--- novelyst stand-ins.
+
+class Scene:
+    """Scene stand-in, counting words and letters when the content is set, as the novel model does."""
+
+    def __init__(self, sceneContent='', scType=0, title=''):
+        self.sceneContent = sceneContent
+        self.scType = scType
+        self.title = title
+
+    @property
+    def sceneContent(self):
+        return self._sceneContent
+
+    @sceneContent.setter
+    def sceneContent(self, text):
+        self._sceneContent = text
+        words = text.split()
+        self.wordCount = len(words)
+        self.letterCount = sum(map(len, words))
+
+
+class Chapter:
+
+    def __init__(self, title='', isTrash=False):
+        self.title = title
+        self.isTrash = isTrash
+        self.srtScenes = []
+
+
+class Novel:
+
+    def __init__(self, title='Test novel', authorName='Test author'):
+        self.title = title
+        self.authorName = authorName
+        self.chapters = {}
+        self.srtChapters = []
+        self.scenes = {}
+
+    def add_scene(self, chId, scId, sceneContent, scType=0):
+        if not chId in self.chapters:
+            self.chapters[chId] = Chapter(f'Chapter {chId}')
+            self.srtChapters.append(chId)
+        self.scenes[scId] = Scene(sceneContent, scType, f'Scene {scId}')
+        self.chapters[chId].srtScenes.append(scId)
+
+
+class PrjFile:
+
+    def __init__(self, filePath, novel, wcLog):
+        self.filePath = filePath
+        self.novel = novel
+        self.wcLog = wcLog
+        self.wcLogUpdate = {}
+
+
+class Ui:
+
+    def __init__(self, prjFile):
+        self.prjFile = prjFile
+        self.novel = prjFile.novel
+        self.isModified = False
+
+
+class Plugin:
+
+    def __init__(self, **kwargs):
+        from nvprogresslib.word_counter import WordCounter
+        self.kwargs = dict(
+            window_geometry='510x440',
+            date_width=100,
+            wordcount_width=100,
+            wordcount_delta_width=100,
+            totalcount_width=100,
+            totalcount_delta_width=100,
+            period='day',
+            word_target=0,
+            show_timings=False,
+            log_timings=False,
+            auto_refresh=False,
+            )
+        self.kwargs.update(kwargs)
+        self.wordCounter = WordCounter()
+
+
+#--- Word count logs.
+
+def make_random_log(seed, days=120, startOrdinal=date(2022, 12, 20).toordinal(), density=0.6):
+    """Return a word count log with random gaps, increases, decreases, and unchanged days.
+
+    key: str -- ISO date.
+    value: list -- [count, totalCount] as strings, as read from a project file.
+    """
+    rnd = random.Random(seed)
+    wcLog = {}
+    count = rnd.randint(0, 500)
+    totalCount = count + rnd.randint(0, 100)
+    for ordinal in range(startOrdinal, startOrdinal + days):
+        if rnd.random() > density:
+            continue
+
+        change = rnd.choice((0, 0, rnd.randint(1, 800), -rnd.randint(1, 200)))
+        count = max(count + change, 0)
+        totalCount = max(totalCount + change + rnd.choice((0, rnd.randint(0, 50))), count)
+        wcLog[date.fromordinal(ordinal).isoformat()] = [str(count), str(totalCount)]
+    return wcLog
+
+
+def get_entries(wcLog):
+    """Return a list of (ordinal, count, totalCount) tuples in chronological order."""
+    entries = []
+    for isoDate in wcLog:
+        count, totalCount = wcLog[isoDate]
+        entries.append((date.fromisoformat(isoDate).toordinal(), int(count), int(totalCount)))
+    entries.sort()
+    return entries
+
+
+def get_period_key(ordinal, period):
+    """Return the period key of a day: ISO date, 'YYYY-Www', 'YYYY-MM', or 'YYYY'."""
+    day = date.fromordinal(ordinal)
+    if period == 'week':
+        return '%04d-W%02d' % day.isocalendar()[:2]
+
+    if period == 'month':
+        return '%04d-%02d' % (day.year, day.month)
+
+    if period == 'year':
+        return '%04d' % day.year
+
+    return day.isoformat()
+
+
+def get_reference_rows(wcLog, period='day', startOrdinal=None, endOrdinal=None):
+    """Return the expected (key, count, countDelta, totalCount, totalCountDelta) rows of a log.
+
+    Walk through the log entries day by day. Each period's differences refer to
+    the counts at the end of the period before, or before the range start.
+    Periods without changes are left out.
+    """
+    periods = {}
+    keys = []
+    last = (0, 0)
+    for ordinal, count, totalCount in get_entries(wcLog):
+        if endOrdinal is not None and ordinal >= endOrdinal:
+            break
+
+        if startOrdinal is None or ordinal >= startOrdinal:
+            key = get_period_key(ordinal, period)
+            if not key in periods:
+                periods[key] = [last, None]
+                keys.append(key)
+            periods[key][1] = (count, totalCount)
+        last = (count, totalCount)
+    rows = []
+    for key in keys:
+        (startCount, startTotalCount), (count, totalCount) = periods[key]
+        if (count - startCount, totalCount - startTotalCount) != (0, 0):
+            rows.append((key, count, count - startCount, totalCount, totalCount - startTotalCount))
+    return rows
+
+
+def get_reference_statistics(entries, todayOrdinal, target=0):
+    """Return the expected statistics of log entries (ordinal, count, totalCount), see WcStatistics.
+
+    The first entry is the baseline. Days with a word count increase are writing days.
+    """
+    deltas = []
+    for i, (ordinal, count, totalCount) in enumerate(entries):
+        if i == 0:
+            deltas.append((ordinal, 0))
+        else:
+            deltas.append((ordinal, count - entries[i - 1][1]))
+    writingDays = [ordinal for ordinal, delta in deltas if delta > 0]
+    longestStreak = 0
+    streak = 0
+    for i, ordinal in enumerate(writingDays):
+        if i and ordinal == writingDays[i - 1] + 1:
+            streak += 1
+        else:
+            streak = 1
+        longestStreak = max(longestStreak, streak)
+    if writingDays and writingDays[-1] >= todayOrdinal - 1:
+        currentStreak = streak
+    else:
+        currentStreak = 0
+    bestDay = None
+    bestDayDelta = 0
+    for ordinal, delta in deltas:
+        if delta > bestDayDelta:
+            bestDay = date.fromordinal(ordinal).isoformat()
+            bestDayDelta = delta
+    statistics = dict(
+        count=entries[-1][1] if entries else 0,
+        currentStreak=currentStreak,
+        longestStreak=longestStreak,
+        bestDay=bestDay,
+        bestDayDelta=bestDayDelta,
+        )
+    for window in (7, 30):
+        statistics[f'average{window}'] = sum(delta for ordinal, delta in deltas if todayOrdinal - window < ordinal <= todayOrdinal) / window
+    remaining = target - statistics['count']
+    if target <= 0:
+        statistics['forecast'] = None
+    elif remaining <= 0:
+        statistics['forecast'] = date.fromordinal(todayOrdinal).isoformat()
+    elif statistics['average30'] > 0:
+        days = 1
+        while days * statistics['average30'] < remaining:
+            days += 1
+        statistics['forecast'] = date.fromordinal(todayOrdinal + days).isoformat()
+    else:
+        statistics['forecast'] = None
+    return statistics
+
+
+#--- tkinter stand-ins.
+
+class FakeWidget:
+    """Widget stand-in accepting any method call, and queuing the scheduled callbacks."""
+
+    def __init__(self, master=None, **kwargs):
+        self.master = master
+        self.calls = []
+        # list of (method name, arguments) of the calls not implemented otherwise.
+        self.scheduled = []
+        # list of (function, arguments) scheduled by after() or after_idle().
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self.calls.append((name, args))
+
+        return record
+
+    def after(self, ms, func=None, *args):
+        self.scheduled.append((func, args))
+        return f'after#{len(self.scheduled)}'
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def run_scheduled(self):
+        """Run the scheduled callbacks, including the ones they schedule."""
+        while self.scheduled:
+            func, args = self.scheduled.pop(0)
+            func(*args)
+
+
+class FakeCombobox(FakeWidget):
+    """Combobox stand-in keeping the selected index."""
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._current = 0
+
+    def current(self, index=None):
+        if index is None:
+            return self._current
+
+        self._current = index
+
+
+class FakeTreeview(FakeWidget):
+    """Treeview stand-in keeping the item hierarchy, values, and tags."""
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._children = {'': []}
+        self._items = {}
+
+    def insert(self, parent, index, iid=None, **kwargs):
+        self.calls.append(('insert', (parent, index, iid)))
+        if index == 'end':
+            index = len(self._children[parent])
+        self._children[parent].insert(int(index), iid)
+        self._children[iid] = []
+        self._items[iid] = dict(kwargs, parent=parent)
+        return iid
+
+    def item(self, iid, option=None, **kwargs):
+        if kwargs:
+            self.calls.append(('item', (iid,)))
+            self._items[iid].update(kwargs)
+            return None
+
+        if option is not None:
+            return self._items[iid].get(option)
+
+        return dict(self._items[iid])
+
+    def delete(self, *iids):
+        self.calls.append(('delete', iids))
+        for iid in iids:
+            self._delete_item(iid)
+
+    def _delete_item(self, iid):
+        for child in list(self._children[iid]):
+            self._delete_item(child)
+        self._children[self._items[iid]['parent']].remove(iid)
+        del self._children[iid]
+        del self._items[iid]
+
+    def move(self, iid, parent, index):
+        self.calls.append(('move', (iid, parent, index)))
+        self._children[self._items[iid]['parent']].remove(iid)
+        self._children[parent].insert(int(index), iid)
+        self._items[iid]['parent'] = parent
+
+    def get_children(self, parent=''):
+        return tuple(self._children.get(parent, ()))
+
+    def exists(self, iid):
+        return iid in self._items
+
+
+class FakeVariable:
+    """Variable stand-in, e.g. for StringVar."""
+
+    def __init__(self, master=None, value=None, name=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+def install_fake_tk():
+    """Replace tkinter and tkinter.ttk by the stand-ins in sys.modules."""
+    tk = types.ModuleType('tkinter')
+    ttk = types.ModuleType('tkinter.ttk')
+    for name in ('Frame', 'Label', 'Button', 'Entry', 'Canvas', 'Scrollbar', 'Notebook'):
+        setattr(tk, name, type(name, (FakeWidget,), {}))
+        setattr(ttk, name, type(name, (FakeWidget,), {}))
+    tk.Toplevel = type('Toplevel', (FakeWidget,), {})
+    tk.StringVar = FakeVariable
+    tk.ttk = ttk
+    ttk.Combobox = FakeCombobox
+    ttk.Treeview = FakeTreeview
+    sys.modules['tkinter'] = tk
+    sys.modules['tkinter.ttk'] = ttk
@@ -0,0 +1,98 @@
+"""Unit tests for the HtmlWcLog class.
+
+The PyWriter project (see https://github.com/peter88213/PyWriter)
+must be located on the same directory level as the novelyst_progress project.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+import helpers
+from nvprogresslib.html_wc_log import HtmlWcLog
+from nvprogresslib.wc_log_series import PERIODS
+from nvprogresslib.wc_log_series import WcLogSeries
+from pywriter.pywriter_globals import Error
+
+HTML_ROW = re.compile(r'<tr>\n<td>(.*?)</td>\n<td>(.*?)</td>\n<td><font color=\w+>(.*?)</font></td>\n'
+                      r'<td><font color=grey>(.*?)</font></td>\n<td><font color=\w+>(.*?)</font></td>\n</tr>\n')
+
+
+def read_file(filePath):
+    with open(filePath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def get_html_rows(text):
+    """Return the table rows of an HTML log as (key, count, countDelta, totalCount, totalCountDelta) tuples."""
+    rows = []
+    for match in HTML_ROW.finditer(text):
+        key, count, countDelta, totalCount, totalCountDelta = match.groups()
+        rows.append((key, int(count), int(countDelta), int(totalCount), int(totalCountDelta)))
+    return rows
+
+
+class ExportTest(unittest.TestCase):
+    """Base class for export tests in a temporary directory."""
+    EXPORT_CLASS = None
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.filePath = os.path.join(self.tempDir, f'novel{self.EXPORT_CLASS.SUFFIX}{self.EXPORT_CLASS.EXTENSION}')
+        self.novel = helpers.Novel()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def write(self, wcLog, filePath=None, **kwargs):
+        """Export a log, and return the export object."""
+        report = self.EXPORT_CLASS(filePath or self.filePath, **kwargs)
+        report.novel = self.novel
+        report.wcLogSeries = WcLogSeries(wcLog)
+        report.write()
+        return report
+
+
+class HtmlWcLogTest(ExportTest):
+    EXPORT_CLASS = HtmlWcLog
+
+    def test_rows(self):
+        wcLog = helpers.make_random_log(1, days=400)
+        self.write(wcLog)
+        text = read_file(self.filePath)
+        self.assertEqual(get_html_rows(text), helpers.get_reference_rows(wcLog))
+        self.assertIn(f'{self.novel.title} by {self.novel.authorName}', text)
+        self.assertTrue(text.endswith('</html>\n'))
+
+    def test_periods(self):
+        wcLog = helpers.make_random_log(1, days=400)
+        for period in PERIODS:
+            self.write(wcLog, period=period)
+            self.assertEqual(get_html_rows(read_file(self.filePath)), helpers.get_reference_rows(wcLog, period))
+
+    def test_date_range(self):
+        wcLog = helpers.make_random_log(3, days=400)
+        startOrdinal = date(2023, 2, 15).toordinal()
+        endOrdinal = date(2023, 9, 30).toordinal()
+        for period in PERIODS:
+            self.write(wcLog, period=period, start_date='2023-02-15', end_date='2023-09-29')
+            self.assertEqual(get_html_rows(read_file(self.filePath)), helpers.get_reference_rows(wcLog, period, startOrdinal, endOrdinal))
+
+    def test_failed_write_keeps_report(self):
+        self.write(helpers.make_random_log(1))
+        text = read_file(self.filePath)
+        with mock.patch('os.replace', side_effect=OSError):
+            with self.assertRaises(Error):
+                self.write(helpers.make_random_log(2))
+        self.assertEqual(read_file(self.filePath), text)
+        self.assertEqual(os.listdir(self.tempDir), [os.path.basename(self.filePath)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Unit tests for the nvprogress_batch command line tool.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import helpers
+import nvprogress_batch
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'nvprogress_batch.py')
+
+
+class FakeWorkFile:
+    """Project file stand-in, reading a random log."""
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.novel = None
+
+    def read(self):
+        self.wcLog = helpers.make_random_log(len(self.filePath))
+        self.wcLogUpdate = {}
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.prjFiles = []
+        for dirName in ('a', 'b', 'c/d'):
+            os.makedirs(os.path.join(self.tempDir, dirName))
+        for filePath in ('a/novel.yw7', 'b/novel.yw7', 'b/other.yw7', 'c/d/deep.yw7'):
+            self.prjFiles.append(os.path.join(self.tempDir, filePath))
+            with open(self.prjFiles[-1], 'w', encoding='utf-8') as f:
+                f.write('<YWRITER7/>')
+        with open(os.path.join(self.tempDir, 'b', 'notes.txt'), 'w', encoding='utf-8') as f:
+            f.write('')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def run_script(self, *args):
+        """Run the tool in a subprocess, and return its exit code."""
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        return subprocess.run([sys.executable, SCRIPT] + list(args), env=env, capture_output=True).returncode
+
+    def test_find_projects(self):
+        self.assertEqual(nvprogress_batch.find_projects([os.path.join(self.tempDir, 'b')]), sorted(self.prjFiles[1:3]))
+        self.assertEqual(nvprogress_batch.find_projects([os.path.join(self.tempDir, '**', '*.yw7')]), sorted(self.prjFiles))
+        self.assertEqual(nvprogress_batch.find_projects([self.prjFiles[0], self.prjFiles[0]]), self.prjFiles[:1])
+        self.assertEqual(nvprogress_batch.find_projects([os.path.join(self.tempDir, 'b', 'notes.txt')]), [])
+
+    def test_output_dirs(self):
+        outputDir = os.path.join(self.tempDir, 'reports')
+        self.assertEqual(nvprogress_batch.get_output_dirs(self.prjFiles, None), dict.fromkeys(self.prjFiles))
+        outputDirs = nvprogress_batch.get_output_dirs(self.prjFiles, outputDir)
+        self.assertEqual(outputDirs[self.prjFiles[2]], outputDir)
+        self.assertEqual(outputDirs[self.prjFiles[3]], outputDir)
+        # Projects with the same file name get different subdirectories.
+        self.assertNotEqual(outputDirs[self.prjFiles[0]], outputDirs[self.prjFiles[1]])
+        for prjFilePath in self.prjFiles[:2]:
+            self.assertEqual(os.path.dirname(outputDirs[prjFilePath]), outputDir)
+
+    def test_same_named_projects(self):
+        outputDir = os.path.join(self.tempDir, 'reports')
+        outputDirs = nvprogress_batch.get_output_dirs(self.prjFiles, outputDir)
+        reports = set()
+        with mock.patch.object(nvprogress_batch, 'WorkFile', FakeWorkFile), mock.patch.object(nvprogress_batch, 'Novel', helpers.Novel):
+            for prjFilePath in self.prjFiles:
+                reports.add(nvprogress_batch.export_report(prjFilePath, 'month', outputDirs[prjFilePath]))
+        self.assertEqual(len(reports), len(self.prjFiles))
+        for reportPath in reports:
+            self.assertTrue(os.path.isfile(reportPath))
+
+    def test_formats(self):
+        with mock.patch.object(nvprogress_batch, 'WorkFile', FakeWorkFile), mock.patch.object(nvprogress_batch, 'Novel', helpers.Novel):
+            for exportFormat, exportClass in nvprogress_batch.EXPORT_CLASSES.items():
+                reportPath = nvprogress_batch.export_report(self.prjFiles[0], exportFormat=exportFormat)
+                self.assertEqual(reportPath, os.path.join(self.tempDir, 'a', f'novel{exportClass.SUFFIX}{exportClass.EXTENSION}'))
+                self.assertTrue(os.path.isfile(reportPath))
+
+    def test_date_range(self):
+        with mock.patch.object(nvprogress_batch, 'WorkFile', FakeWorkFile), mock.patch.object(nvprogress_batch, 'Novel', helpers.Novel):
+            reportPath = nvprogress_batch.export_report(self.prjFiles[0], exportFormat='csv', startDate='2023-01-01', endDate='2023-01-31')
+        with open(reportPath, encoding='utf-8') as f:
+            dates = [line.split(',')[0] for line in f.read().splitlines()[1:]]
+        self.assertTrue(dates)
+        self.assertTrue(all('2023-01-01' <= isoDate <= '2023-01-31' for isoDate in dates))
+
+    def test_exit_code(self):
+        self.assertEqual(self.run_script(os.path.join(self.tempDir, 'b', 'notes.txt')), 0)
+        self.assertEqual(self.run_script('-w', '1', os.path.join(self.tempDir, 'missing.yw7')), 1)
+        self.assertEqual(self.run_script('-w', '0', self.prjFiles[0]), 2)
+        self.assertEqual(self.run_script('-p', 'decade', self.prjFiles[0]), 2)
+        self.assertEqual(self.run_script('-f', 'pdf', self.prjFiles[0]), 2)
+        self.assertEqual(self.run_script('--from', '2023-02-30', self.prjFiles[0]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
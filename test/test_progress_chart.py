@@ -0,0 +1,105 @@
+"""Unit tests for the MinMaxPyramid and ProgressChart classes, using tkinter stand-ins.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import random
+import unittest
+from datetime import date
+import helpers
+helpers.install_fake_tk()
+from nvprogresslib.progress_chart import MinMaxPyramid
+from nvprogresslib.progress_chart import ProgressChart
+from nvprogresslib.wc_log_series import WcLogSeries
+
+WIDTH = 400
+HEIGHT = 300
+
+
+def make_chart(wcLogSeries):
+    chart = ProgressChart()
+    chart.winfo_width = lambda: WIDTH
+    chart.winfo_height = lambda: HEIGHT
+    chart.set_series(wcLogSeries)
+    chart.run_scheduled()
+    return chart
+
+
+def get_drawing_calls(chart):
+    return [call for call in chart.calls if call[0].startswith('create_')]
+
+
+class MinMaxPyramidTest(unittest.TestCase):
+
+    def test_range_minmax(self):
+        rnd = random.Random(1)
+        for length in range(1, 40):
+            values = [rnd.randint(-1000, 1000) for __ in range(length)]
+            pyramid = MinMaxPyramid(values)
+            for start in range(length):
+                self.assertEqual(pyramid.range_minmax(start, start), (None, None))
+                for end in range(start + 1, length + 1):
+                    self.assertEqual(pyramid.range_minmax(start, end), (min(values[start:end]), max(values[start:end])))
+
+    def test_update_last(self):
+        rnd = random.Random(2)
+        for length in (1, 2, 7, 16, 33):
+            values = [rnd.randint(0, 100) for __ in range(length)]
+            pyramid = MinMaxPyramid(values)
+            for value in (-5, 500, 50):
+                values[-1] = value
+                pyramid.update_last(value)
+                for start in range(length):
+                    self.assertEqual(pyramid.range_minmax(start, length), (min(values[start:]), max(values[start:])))
+
+
+class ProgressChartTest(unittest.TestCase):
+
+    def test_draw_cost_depends_on_width(self):
+        for days in (100, 20000):
+            chart = make_chart(WcLogSeries(helpers.make_random_log(1, days=days, density=0.9)))
+            calls = get_drawing_calls(chart)
+            # One count line, one delta per pixel column at most, the baseline, and the labels.
+            self.assertLessEqual(len(calls), WIDTH + 6)
+            countLine = calls[0][1]
+            self.assertLessEqual(len(countLine), 4 * WIDTH)
+
+    def test_update_series(self):
+        wcLog = helpers.make_random_log(3, days=500, density=0.9)
+        series = WcLogSeries(wcLog)
+        chart = make_chart(series)
+        pyramid = chart._pyramid
+
+        # Refreshing the last day updates the pyramid in place.
+        series.set_day(max(wcLog), 99999, 99999)
+        chart.update_series(series.ordinals[-1])
+        chart.run_scheduled()
+        self.assertIs(chart._pyramid, pyramid)
+        self.assertEqual(chart._pyramid.range_minmax(0, len(series)), (min(series.counts), max(series.counts)))
+
+        # Changing an earlier day rebuilds the pyramid.
+        series.set_day(min(wcLog), -99999, 0)
+        chart.update_series(series.ordinals[0])
+        chart.run_scheduled()
+        self.assertIsNot(chart._pyramid, pyramid)
+        self.assertEqual(chart._pyramid.range_minmax(0, len(series)), (-99999, 99999))
+
+    def test_view_follows_new_days(self):
+        series = WcLogSeries(helpers.make_random_log(4, days=200))
+        chart = make_chart(series)
+        nextDay = series.ordinals[-1] + 3
+        series.set_day(date.fromordinal(nextDay).isoformat(), 5, 5)
+        chart.update_series(nextDay)
+        self.assertEqual((chart._viewStart, chart._viewEnd), (series.ordinals[0], nextDay + 1))
+
+        # A zoomed view not showing the last day stays.
+        chart._set_view(series.ordinals[0], 30)
+        nextDay += 1
+        series.set_day(date.fromordinal(nextDay).isoformat(), 6, 6)
+        chart.update_series(nextDay)
+        self.assertEqual((chart._viewStart, chart._viewEnd), (series.ordinals[0], series.ordinals[0] + 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Unit tests for the ProgressIndex class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import helpers
+from nvprogresslib.progress_index import ProgressIndex
+from nvprogresslib.wc_log_series import WcLogSeries
+
+
+class ProgressIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.prjFilePath = os.path.join(self.tempDir, 'novel.yw7')
+        with open(self.prjFilePath, 'w', encoding='utf-8') as f:
+            f.write('<YWRITER7/>')
+        self.wcLogSeries = WcLogSeries(helpers.make_random_log(1))
+        self.sceneCounts = {'1': (100, 523), '2': (0, 0), 'Ä': (7, 2147483647)}
+        self.statistics = dict(days=3, recent=[[738000, 5]])
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def test_file_path(self):
+        self.assertEqual(ProgressIndex(self.prjFilePath).filePath, os.path.join(self.tempDir, 'novel_progress.idx'))
+
+    def test_round_trip(self):
+        ProgressIndex(self.prjFilePath).write(self.wcLogSeries, self.sceneCounts, self.statistics)
+        index = ProgressIndex(self.prjFilePath)
+        self.assertTrue(index.read())
+        self.assertEqual(list(index.wcLogSeries.ordinals), list(self.wcLogSeries.ordinals))
+        self.assertEqual(list(index.wcLogSeries.rows()), list(self.wcLogSeries.rows()))
+        self.assertEqual(list(index.wcLogSeries.changed), list(self.wcLogSeries.changed))
+        self.assertEqual(index.sceneCounts, self.sceneCounts)
+        self.assertEqual(index.statistics, self.statistics)
+
+    def test_empty(self):
+        ProgressIndex(self.prjFilePath).write(WcLogSeries(), {})
+        index = ProgressIndex(self.prjFilePath)
+        self.assertTrue(index.read())
+        self.assertEqual(len(index.wcLogSeries), 0)
+        self.assertEqual(index.sceneCounts, {})
+        self.assertIsNone(index.statistics)
+
+    def test_missing(self):
+        self.assertFalse(ProgressIndex(self.prjFilePath).read())
+
+    def test_stale(self):
+        ProgressIndex(self.prjFilePath).write(self.wcLogSeries, self.sceneCounts)
+        with open(self.prjFilePath, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertFalse(ProgressIndex(self.prjFilePath).read())
+
+    def test_truncated(self):
+        index = ProgressIndex(self.prjFilePath)
+        index.write(self.wcLogSeries, self.sceneCounts, self.statistics)
+        with open(index.filePath, 'rb') as f:
+            data = f.read()
+        for size in (0, 10, len(data) // 2, len(data) - 1):
+            with open(index.filePath, 'wb') as f:
+                f.write(data[:size])
+            self.assertFalse(ProgressIndex(self.prjFilePath).read())
+
+    def test_write_failure_is_ignored(self):
+        os.remove(self.prjFilePath)
+        index = ProgressIndex(self.prjFilePath)
+        index.write(self.wcLogSeries, self.sceneCounts)
+        self.assertFalse(os.path.isfile(index.filePath))
+        self.assertEqual(os.listdir(self.tempDir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+"""Unit tests for the ProgressList class, using tkinter stand-ins.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import unittest
+import helpers
+helpers.install_fake_tk()
+from datetime import date
+from nvprogresslib.progress_list import ProgressList
+from nvprogresslib.wc_log_series import PERIODS
+from nvprogresslib.wc_log_series import WcLogSeries
+
+START = date(2020, 1, 1).toordinal()
+
+
+def make_log(number):
+    """Return a word count log of a number of days, all with word count changes."""
+    wcLog = {}
+    for i in range(number):
+        wcLog[iso(i)] = [str(i * 10 + i % 3 + 1), str(i * 11 + i % 3 + 2)]
+    return wcLog
+
+
+def iso(i):
+    """Return the ISO date of the day i of the log."""
+    return date.fromordinal(START + i).isoformat()
+
+
+class ProgressListTest(unittest.TestCase):
+
+    def setUp(self):
+        self.wcLog = make_log(1000)
+        self.series = WcLogSeries(self.wcLog)
+        self.logList = ProgressList()
+        self.logList.set_series(self.series)
+        self.logList.refresh()
+
+    def get_shown(self):
+        """Return the list of (iid, values) tuples inserted into the tree."""
+        tree = self.logList.tree
+        return [(iid, tree.item(iid, 'values')) for iid in tree.get_children('')]
+
+    def get_expected(self, start, end, period='day', startOrdinal=None, endOrdinal=None):
+        """Return the list of (iid, values) tuples expected at a range of display positions."""
+        expected = []
+        for row in list(reversed(helpers.get_reference_rows(self.wcLog, period, startOrdinal, endOrdinal)))[start:end]:
+            expected.append((row[0], [row[0]] + [str(value) for value in row[1:]]))
+        return expected
+
+    def scroll(self, first, last):
+        """Pass visible fractions of the inserted rows, and process the resulting updates."""
+        self.logList._on_tree_scroll(str(first), str(last))
+        self.logList.run_scheduled()
+
+    def test_first_page(self):
+        self.assertEqual(self.get_shown(), self.get_expected(0, ProgressList._PAGE_SIZE))
+        self.assertEqual(self.logList.tree.item(iso(999), 'tags'), ('positive'))
+
+    def test_scroll_down_and_up(self):
+        for i in range(10):
+            self.scroll(0.9, 1.0)
+        shown = self.get_shown()
+        self.assertEqual(len(shown), ProgressList._MAX_ROWS)
+        start = self.logList._windowStart
+        self.assertGreater(start, 0)
+        self.assertEqual(shown, self.get_expected(start, start + ProgressList._MAX_ROWS))
+        # The rows removed above the view are compensated by scrolling.
+        self.assertIn(('yview_scroll', (-ProgressList._PAGE_SIZE, 'units')), self.logList.tree.calls)
+
+        for i in range(20):
+            self.scroll(0.0, 0.1)
+        self.assertEqual(self.logList._windowStart, 0)
+        self.assertEqual(self.get_shown(), self.get_expected(0, ProgressList._MAX_ROWS))
+
+    def test_scrollbar(self):
+        self.logList._on_scrollbar('moveto', '0.5')
+        start = self.logList._windowStart
+        self.assertEqual(start, 500 - ProgressList._BUFFER_ROWS)
+        self.assertEqual(self.get_shown(), self.get_expected(start, start + ProgressList._PAGE_SIZE))
+
+        # The scrollbar refers to the whole list.
+        self.logList._on_tree_scroll('0.4', '0.6')
+        first, last = self.logList._scrollY.calls[-1][1]
+        self.assertAlmostEqual(first, (start + 0.4 * ProgressList._PAGE_SIZE) / 1000)
+        self.assertAlmostEqual(last, (start + 0.6 * ProgressList._PAGE_SIZE) / 1000)
+
+        self.logList._on_scrollbar('moveto', '1.0')
+        self.assertEqual(self.get_shown(), self.get_expected(1000 - ProgressList._PAGE_SIZE, 1000))
+
+    def test_refresh(self):
+        tree = self.logList.tree
+        self.set_day(iso(999), 1, 3)
+        self.set_day(iso(1000), 5, 6)
+        del tree.calls[:]
+        self.logList.refresh()
+        self.assertEqual(self.get_shown(), self.get_expected(0, ProgressList._PAGE_SIZE))
+        self.assertEqual(tree.calls, [
+            ('delete', (iso(950),)),
+            ('insert', ('', 0, iso(1000))),
+            ('item', (iso(999),)),
+            ])
+
+        # A list scrolled to its end grows at the end.
+        self.logList._on_scrollbar('moveto', '1.0')
+        self.set_day(iso(-1), 1, 1)
+        self.logList.refresh()
+        self.assertEqual(self.get_shown()[-1][0], iso(-1))
+        self.assertEqual(self.get_shown(), self.get_expected(1002 - len(self.get_shown()), 1002))
+
+        # Rows vanished from the model are deleted.
+        self.wcLog = make_log(10)
+        self.series = WcLogSeries(self.wcLog)
+        self.logList.set_series(self.series)
+        self.logList.refresh()
+        self.assertEqual(self.get_shown(), self.get_expected(0, 10))
+
+    def test_short_list(self):
+        self.wcLog = make_log(3)
+        self.logList.set_series(WcLogSeries(self.wcLog))
+        self.logList.refresh()
+        self.assertEqual(self.get_shown(), self.get_expected(0, 3))
+        self.scroll(0.0, 1.0)
+        self.assertEqual(self.get_shown(), self.get_expected(0, 3))
+        self.logList.reset()
+        self.assertEqual(self.get_shown(), [])
+
+    def test_periods(self):
+        self.wcLog = helpers.make_random_log(1, days=3000, density=0.3)
+        self.series = WcLogSeries(self.wcLog)
+        for period in PERIODS:
+            self.logList.reset()
+            self.logList.set_series(self.series, period)
+            self.logList.refresh()
+            self.logList._on_scrollbar('moveto', '0.5')
+            start = self.logList._windowStart
+            self.assertEqual(self.get_shown(), self.get_expected(start, start + len(self.get_shown()), period))
+            self.assertEqual(self.logList._get_row_count(), len(helpers.get_reference_rows(self.wcLog, period)))
+
+    def test_period_update(self):
+        for seed in range(6):
+            self.wcLog = helpers.make_random_log(seed, days=1000, density=0.3)
+            self.series = WcLogSeries(self.wcLog)
+            for period in PERIODS:
+                self.logList.reset()
+                self.logList.set_series(self.series, period)
+                self.logList.refresh()
+                changes = helpers.make_random_log(seed + 50, days=60, startOrdinal=START + 900 + seed * 20, density=0.2)
+                for isoDate in changes:
+                    self.set_day(isoDate, *map(int, changes[isoDate]))
+                    self.logList.update_series(date.fromisoformat(isoDate).toordinal())
+                    self.logList.refresh()
+                    self.assertEqual(self.get_shown(), self.get_expected(0, len(self.get_shown()), period))
+                self.assertEqual(self.logList._get_row_count(), len(helpers.get_reference_rows(self.wcLog, period)))
+
+    def test_date_range(self):
+        self.wcLog = helpers.make_random_log(7, days=1000, startOrdinal=START, density=0.5)
+        self.series = WcLogSeries(self.wcLog)
+        startOrdinal = START + 300
+        endOrdinal = START + 700
+        for period in PERIODS:
+            self.logList.reset()
+            self.logList.set_series(self.series, period, startOrdinal, endOrdinal)
+            self.logList.refresh()
+            expectedCount = len(helpers.get_reference_rows(self.wcLog, period, startOrdinal, endOrdinal))
+            self.assertEqual(self.logList._get_row_count(), expectedCount)
+            self.logList._on_scrollbar('moveto', '0.99')
+            start = self.logList._windowStart
+            self.assertEqual(self.get_shown(), self.get_expected(start, start + len(self.get_shown()), period, startOrdinal, endOrdinal))
+
+            # Days inserted or changed before, within, and after the range.
+            self.logList.reset()
+            self.logList.refresh()
+            for ordinal in (START - 10, START + 299, START + 300, START + 512, START + 699, START + 700, START + 1100):
+                isoDate = date.fromordinal(ordinal).isoformat()
+                self.set_day(isoDate, ordinal - START + 5000, ordinal - START + 6000)
+                self.logList.update_series(ordinal)
+                self.logList.refresh()
+                self.assertEqual(self.get_shown(), self.get_expected(0, len(self.get_shown()), period, startOrdinal, endOrdinal))
+                self.assertEqual(self.logList._get_row_count(), len(helpers.get_reference_rows(self.wcLog, period, startOrdinal, endOrdinal)))
+
+    def set_day(self, isoDate, count, totalCount):
+        """Set a day's word counts in the log and in the series."""
+        self.wcLog[isoDate] = [str(count), str(totalCount)]
+        self.series.set_day(isoDate, count, totalCount)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+"""Unit tests for the ProgressViewer class, using tkinter and novelyst stand-ins.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+import helpers
+helpers.install_fake_tk()
+from nvprogresslib.progress_index import ProgressIndex
+from nvprogresslib.progress_viewer import ProgressViewer
+from nvprogresslib.wc_log_series import WcLogSeries
+
+
+class ProgressViewerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.today = date.today().toordinal()
+        self.novel = helpers.Novel()
+        self.novel.add_scene('1', '1', 'one two three')
+        self.novel.add_scene('1', '2', 'four five', 1)
+        self.prjFile = helpers.PrjFile(
+            os.path.join(self.tempDir.name, 'test.yw7'),
+            self.novel,
+            helpers.make_random_log(1, days=300, startOrdinal=self.today - 300),
+            )
+        self.ui = helpers.Ui(self.prjFile)
+        self.plugin = helpers.Plugin()
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def get_expected_log(self):
+        """Return the expected log: the project's logs and the actual word count of today."""
+        wcLog = dict(self.prjFile.wcLog)
+        wcLog.update(self.prjFile.wcLogUpdate)
+        wcLog[date.today().isoformat()] = ['3', '5']
+        return wcLog
+
+    def get_expected_rows(self):
+        """Return the expected rows of the project's logs and the actual word count of today."""
+        return helpers.get_reference_rows(self.get_expected_log())
+
+    def open_viewer(self):
+        viewer = ProgressViewer(self.plugin, self.ui)
+        viewer.run_scheduled()
+        return viewer
+
+    def get_shown_values(self, viewer):
+        tree = viewer.tree
+        return [tree.item(iid, 'values') for iid in tree.get_children('')]
+
+    def get_statistics(self, viewer):
+        return viewer._statistics.get_statistics(self.today, 100000)
+
+    def get_reference_statistics(self, viewer):
+        series = viewer.wcLogSeries
+        entries = list(zip(series.ordinals, series.counts, series.totalCounts))
+        return helpers.get_reference_statistics(entries, self.today, 100000)
+
+    def test_open(self):
+        viewer = self.open_viewer()
+        expected = self.get_expected_rows()
+        self.assertEqual(list(viewer.wcLogSeries.rows()), expected)
+        shown = self.get_shown_values(viewer)
+        self.assertEqual(shown[0], [expected[-1][0]] + [str(value) for value in expected[-1][1:]])
+
+    def test_refresh(self):
+        viewer = self.open_viewer()
+        tree = viewer.tree
+        del tree.calls[:]
+        viewer.build_tree()
+        viewer.run_scheduled()
+        self.assertEqual(tree.calls, [])
+
+        # Today's word count changes.
+        self.novel.scenes['1'].sceneContent = 'one two three four five six'
+        viewer.build_tree()
+        viewer.run_scheduled()
+        self.assertEqual(tree.calls, [('item', (date.today().isoformat(),))])
+
+        # The project is saved, adding today's entry to the log.
+        self.prjFile.wcLogUpdate[date.today().isoformat()] = ['6', '8']
+        self.novel.scenes['2'].sceneContent = 'four'
+        viewer.build_tree()
+        viewer.run_scheduled()
+        self.assert_viewers_equal(viewer, self.open_viewer())
+
+        # An older entry changes.
+        self.prjFile.wcLog[min(self.prjFile.wcLog)] = ['1', '1']
+        viewer.build_tree()
+        viewer.run_scheduled()
+        self.assert_viewers_equal(viewer, self.open_viewer())
+
+        # An older entry changes, making it the best day.
+        self.prjFile.wcLog[sorted(self.prjFile.wcLog)[len(self.prjFile.wcLog) // 2]] = ['90000', '90000']
+        viewer.build_tree()
+        viewer.run_scheduled()
+        self.assert_viewers_equal(viewer, self.open_viewer())
+
+        # An entry is removed, which requires a rebuild.
+        del self.prjFile.wcLog[max(self.prjFile.wcLog)]
+        viewer.build_tree()
+        viewer.run_scheduled()
+        self.assert_viewers_equal(viewer, self.open_viewer())
+
+    def test_background_count(self):
+        viewer = ProgressViewer(self.plugin, self.ui)
+        # The stored log is shown before the count is finished.
+        self.assertNotIn(date.today().isoformat(), viewer.tree.get_children(''))
+        counts = []
+        count = self.plugin.wordCounter.count
+
+        def count_words(novel):
+            counts.append(novel)
+            return count(novel)
+
+        self.plugin.wordCounter.count = count_words
+        for i in range(3):
+            viewer.build_tree()
+        viewer.run_scheduled()
+        # The first count was running, so the refresh requests were coalesced into one recount.
+        self.assertEqual(len(counts), 1)
+        self.assertEqual(list(viewer.wcLogSeries.rows()), self.get_expected_rows())
+        self.assertEqual(viewer.tree.get_children('')[0], date.today().isoformat())
+
+    def test_auto_refresh(self):
+        self.plugin.kwargs['auto_refresh'] = True
+        viewer = ProgressViewer(self.plugin, self.ui)
+        self.assertEqual(self.get_scheduled(viewer), [viewer._watch_project, viewer._poll_count])
+        del viewer.scheduled[:]
+        viewer._countFuture.result()
+        viewer._poll_count()
+
+        # Without changes, no refresh is scheduled.
+        viewer._watch_project()
+        self.assertEqual(self.get_scheduled(viewer), [viewer._watch_project])
+
+        # Editing the project schedules a refresh, which updates today's row.
+        del viewer.scheduled[:]
+        self.novel.scenes['1'].sceneContent = 'one two three four'
+        self.ui.isModified = True
+        viewer._watch_project()
+        self.assertEqual(self.get_scheduled(viewer), [viewer._auto_refresh, viewer._watch_project])
+        del viewer.scheduled[:]
+        viewer._auto_refresh()
+        # While the project is modified, the refresh is repeated.
+        self.assertEqual(self.get_scheduled(viewer), [viewer._poll_count, viewer._auto_refresh])
+        self.ui.isModified = False
+        viewer.run_scheduled()
+        self.assertEqual(self.get_shown_values(viewer)[0][:2], [date.today().isoformat(), '4'])
+
+        # A replaced log rebuilds the view.
+        self.prjFile.wcLog = dict(self.prjFile.wcLog)
+        del self.prjFile.wcLog[max(self.prjFile.wcLog)]
+        viewer._auto_refresh()
+        viewer.run_scheduled()
+        self.plugin.kwargs['auto_refresh'] = False
+        self.assert_viewers_equal(viewer, self.open_viewer())
+
+    def get_scheduled(self, viewer):
+        return [func for func, args in viewer.scheduled]
+
+    def test_index(self):
+        with open(self.prjFile.filePath, 'w', encoding='utf-8') as f:
+            f.write('<YWRITER7/>')
+        viewer = self.open_viewer()
+        index = ProgressIndex(self.prjFile.filePath)
+        self.assertTrue(index.read())
+        self.assertEqual(index.sceneCounts, {'1': (3, 11), '2': (2, 8)})
+
+        # A warm open loads the series from the index, and applies the word count determined when opening.
+        self.plugin = helpers.Plugin()
+        self.prjFile.wcLogUpdate[date.today().isoformat()] = ['6', '8']
+        with mock.patch('nvprogresslib.progress_viewer.WcLogSeries', side_effect=AssertionError):
+            reference = self.open_viewer()
+        self.assertEqual(list(reference.wcLogSeries.rows()), self.get_expected_rows())
+        self.assertEqual(self.get_shown_values(reference), self.get_shown_values(viewer))
+        self.assertEqual(self.get_statistics(reference), self.get_reference_statistics(reference))
+
+        # A stale index is rebuilt.
+        with open(self.prjFile.filePath, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.prjFile.wcLog[min(self.prjFile.wcLog)] = ['1', '1']
+        viewer = self.open_viewer()
+        self.assertTrue(index.read())
+        self.assertEqual(list(index.wcLogSeries.rows()), list(WcLogSeries(self.prjFile.wcLog, self.prjFile.wcLogUpdate).rows()))
+
+    def test_period_change(self):
+        viewer = self.open_viewer()
+        viewer._periodSelector.current(2)
+        viewer._on_period_change()
+        self.assertEqual(self.plugin.kwargs['period'], 'month')
+        expected = helpers.get_reference_rows(self.get_expected_log(), 'month')
+        self.assertEqual(self.get_shown_values(viewer)[0], [expected[-1][0]] + [str(value) for value in expected[-1][1:]])
+
+        # Today's word count changes.
+        self.novel.scenes['1'].sceneContent = 'one two three four five six'
+        viewer.build_tree()
+        viewer.run_scheduled()
+        reference = self.open_viewer()
+        self.assertEqual(self.get_shown_values(viewer)[0][0], expected[-1][0])
+        self.assert_viewers_equal(viewer, reference)
+
+    def test_date_range(self):
+        viewer = self.open_viewer()
+        startOrdinal = self.today - 200
+        endOrdinal = self.today - 100
+        viewer._startDate.set(date.fromordinal(startOrdinal).isoformat())
+        viewer._endDate.set(f' {date.fromordinal(endOrdinal - 1).isoformat()} ')
+        viewer._on_range_change()
+        self.assertEqual(viewer._endDate.get(), date.fromordinal(endOrdinal - 1).isoformat())
+        expected = helpers.get_reference_rows(self.get_expected_log(), 'day', startOrdinal, endOrdinal)
+        shown = self.get_shown_values(viewer)
+        self.assertEqual(shown[0], [expected[-1][0]] + [str(value) for value in expected[-1][1:]])
+        self.assertEqual(viewer._logList._get_row_count(), len(expected))
+
+        # An invalid date keeps the range; an empty field removes the limit.
+        viewer._startDate.set('2023-13-45')
+        viewer._endDate.set('')
+        viewer._on_range_change()
+        self.assertEqual(viewer._startDate.get(), date.fromordinal(startOrdinal).isoformat())
+        self.assertEqual(viewer._logList._get_row_count(), len(helpers.get_reference_rows(self.get_expected_log(), 'day', startOrdinal)))
+
+    def assert_viewers_equal(self, viewer, reference):
+        self.assertEqual(list(viewer.wcLogSeries.ordinals), list(reference.wcLogSeries.ordinals))
+        self.assertEqual(list(viewer.wcLogSeries.rows()), list(reference.wcLogSeries.rows()))
+        self.assertEqual(self.get_shown_values(viewer), self.get_shown_values(reference))
+        self.assertEqual(self.get_statistics(viewer), self.get_statistics(reference))
+        self.assertEqual(self.get_statistics(viewer), self.get_reference_statistics(viewer))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Unit tests for the TimingLog class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import tempfile
+import threading
+import unittest
+import helpers
+from nvprogresslib.timing_log import TimingLog
+
+
+class TimingLogTest(unittest.TestCase):
+
+    def test_span(self):
+        timingLog = TimingLog()
+        with timingLog.span('first'):
+            pass
+        with self.assertRaises(ValueError):
+            with timingLog.span('second'):
+                raise ValueError
+        timings = timingLog.get_timings()
+        self.assertEqual([timing[0] for timing in timings], ['first', 'second'])
+        self.assertTrue(all(timing[2] >= 0 for timing in timings))
+
+    def test_get_timings(self):
+        timingLog = TimingLog()
+        for i in range(TimingLog.MAX_ENTRIES + 10):
+            timingLog.add(f'op{i % 3}', i)
+        self.assertEqual(len(timingLog.get_timings()), TimingLog.MAX_ENTRIES)
+        self.assertEqual([timing[2] for timing in timingLog.get_timings(3)], [TimingLog.MAX_ENTRIES + 7, TimingLog.MAX_ENTRIES + 8, TimingLog.MAX_ENTRIES + 9])
+        self.assertEqual(timingLog.get_last('op0'), TimingLog.MAX_ENTRIES + 8)
+        self.assertIsNone(timingLog.get_last('missing'))
+
+    def test_concurrent_add(self):
+        timingLog = TimingLog()
+
+        def add_many():
+            for __ in range(5000):
+                timingLog.add('worker', 0.001)
+
+        worker = threading.Thread(target=add_many)
+        worker.start()
+        while worker.is_alive():
+            timingLog.get_last('missing')
+        worker.join()
+        self.assertEqual(timingLog.get_last('worker'), 0.001)
+
+    def test_file_log(self):
+        timingLog = TimingLog()
+        with tempfile.TemporaryDirectory() as tempDir:
+            logPath = os.path.join(tempDir, 'timing.log')
+            timingLog.enable_file_log(logPath)
+            timingLog.add('logged', 0.0125)
+            timingLog.disable_file_log()
+            timingLog.add('not logged', 0.0125)
+            with open(logPath, encoding='utf-8') as f:
+                text = f.read()
+        self.assertIn('logged 12.500 ms', text)
+        self.assertNotIn('not logged', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Unit tests for the CsvWcLog, JsonlWcLog, and OdsWcLog classes.
+
+The PyWriter project (see https://github.com/peter88213/PyWriter)
+must be located on the same directory level as the novelyst_progress project.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import csv
+import json
+import os
+import unittest
+import zipfile
+import xml.etree.ElementTree as ET
+from unittest import mock
+import helpers
+from test_html_wc_log import ExportTest
+from nvprogresslib.csv_wc_log import CsvWcLog
+from nvprogresslib.jsonl_wc_log import JsonlWcLog
+from nvprogresslib.ods_wc_log import OdsWcLog
+from nvprogresslib.wc_log_series import PERIODS
+from pywriter.pywriter_globals import Error
+
+KEYS = ('date', 'count', 'countDelta', 'totalCount', 'totalCountDelta')
+ODS_NAMESPACES = dict(
+    office='urn:oasis:names:tc:opendocument:xmlns:office:1.0',
+    table='urn:oasis:names:tc:opendocument:xmlns:table:1.0',
+    text='urn:oasis:names:tc:opendocument:xmlns:text:1.0',
+    )
+
+
+class CsvWcLogTest(ExportTest):
+    EXPORT_CLASS = CsvWcLog
+
+    def get_rows(self):
+        with open(self.filePath, 'r', encoding='utf-8', newline='') as f:
+            lines = list(csv.reader(f))
+        self.assertEqual(tuple(lines[0]), KEYS)
+        return [(line[0],) + tuple(int(value) for value in line[1:]) for line in lines[1:]]
+
+    def test_periods(self):
+        wcLog = helpers.make_random_log(1, days=400)
+        for period in PERIODS:
+            self.write(wcLog, period=period)
+            self.assertEqual(self.get_rows(), helpers.get_reference_rows(wcLog, period))
+
+    def test_empty(self):
+        self.write({})
+        self.assertEqual(self.get_rows(), [])
+
+
+class JsonlWcLogTest(ExportTest):
+    EXPORT_CLASS = JsonlWcLog
+
+    def get_rows(self):
+        rows = []
+        with open(self.filePath, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                self.assertEqual(tuple(record), KEYS)
+                rows.append(tuple(record[key] for key in KEYS))
+        return rows
+
+    def test_periods(self):
+        wcLog = helpers.make_random_log(2, days=400)
+        for period in PERIODS:
+            self.write(wcLog, period=period)
+            self.assertEqual(self.get_rows(), helpers.get_reference_rows(wcLog, period))
+
+    def test_chunks(self):
+        # The lines are written in chunks, not joined to one text.
+        wcLog = helpers.make_random_log(3, days=3000, density=0.9)
+        with mock.patch.object(JsonlWcLog, '_get_text', side_effect=AssertionError):
+            self.write(wcLog)
+        self.assertEqual(self.get_rows(), helpers.get_reference_rows(wcLog))
+
+
+class OdsWcLogTest(ExportTest):
+    EXPORT_CLASS = OdsWcLog
+
+    def get_rows(self):
+        with zipfile.ZipFile(self.filePath) as odsFile:
+            entries = odsFile.infolist()
+            self.assertEqual(entries[0].filename, 'mimetype')
+            self.assertEqual(entries[0].compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(odsFile.read('mimetype'), b'application/vnd.oasis.opendocument.spreadsheet')
+            self.assertIn('META-INF/manifest.xml', odsFile.namelist())
+            root = ET.fromstring(odsFile.read('content.xml'))
+        valueKey = f'{{{ODS_NAMESPACES["office"]}}}value'
+        rows = []
+        tableRows = root.findall('.//table:table-row', ODS_NAMESPACES)
+        # The first row holds the headings.
+        for tableRow in tableRows[1:]:
+            cells = list(tableRow)
+            key = cells[0].find('text:p', ODS_NAMESPACES).text
+            rows.append((key,) + tuple(int(cell.get(valueKey)) for cell in cells[1:]))
+        return rows
+
+    def test_periods(self):
+        wcLog = helpers.make_random_log(4, days=400)
+        for period in PERIODS:
+            self.write(wcLog, period=period)
+            self.assertEqual(self.get_rows(), helpers.get_reference_rows(wcLog, period))
+
+    def test_failed_write_keeps_report(self):
+        self.write(helpers.make_random_log(1))
+        rows = self.get_rows()
+        with mock.patch.object(OdsWcLog, '_get_rows', side_effect=ValueError):
+            with self.assertRaises(Error):
+                self.write(helpers.make_random_log(2))
+        self.assertEqual(self.get_rows(), rows)
+        self.assertEqual(os.listdir(self.tempDir), [os.path.basename(self.filePath)])
+
+
+if __name__ == '__main__':
+    unittest.main()
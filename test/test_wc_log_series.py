@@ -0,0 +1,184 @@
+"""Unit tests for the WcLogSeries class and the period functions.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import unittest
+from datetime import date
+from unittest import mock
+import helpers
+from nvprogresslib import wc_log_series
+from nvprogresslib.wc_log_series import PERIODS
+from nvprogresslib.wc_log_series import WcLogSeries
+from nvprogresslib.wc_log_series import get_period
+from nvprogresslib.wc_log_series import get_period_start
+from nvprogresslib.wc_log_series import iso_to_ordinal
+from nvprogresslib.wc_log_series import ordinal_to_iso
+
+SEEDS = range(12)
+START = date(2022, 12, 20).toordinal()
+
+
+class PeriodTest(unittest.TestCase):
+
+    def test_iso_ordinal_conversion(self):
+        for isoDate in ('2020-02-29', '2023-01-01', '2023-12-31'):
+            self.assertEqual(ordinal_to_iso(iso_to_ordinal(isoDate)), isoDate)
+
+    def test_get_period(self):
+        for ordinal in range(START - 400, START + 400):
+            for period in PERIODS:
+                key, nextStart = get_period(ordinal, period)
+                self.assertEqual(key, helpers.get_period_key(ordinal, period))
+                self.assertNotEqual(helpers.get_period_key(nextStart, period), key)
+                self.assertEqual(helpers.get_period_key(nextStart - 1, period), key)
+
+    def test_get_period_start(self):
+        for ordinal in range(START - 400, START + 400):
+            for period in PERIODS:
+                start = get_period_start(ordinal, period)
+                self.assertLessEqual(start, ordinal)
+                self.assertEqual(helpers.get_period_key(start, period), helpers.get_period_key(ordinal, period))
+                self.assertNotEqual(helpers.get_period_key(start - 1, period), helpers.get_period_key(ordinal, period))
+
+    def test_period_keys_sort_chronologically(self):
+        for period in PERIODS:
+            keys = [helpers.get_period_key(ordinal, period) for ordinal in range(START - 400, START + 400)]
+            self.assertEqual(keys, sorted(keys))
+
+
+class WcLogSeriesTest(unittest.TestCase):
+
+    def assert_series_equal(self, series, entries):
+        """Assert that a series holds entries (ordinal, count, totalCount), with consistent differences."""
+        self.assertEqual(list(zip(series.ordinals, series.counts, series.totalCounts)), entries)
+        lastCount = 0
+        lastTotalCount = 0
+        changed = []
+        for i, (ordinal, count, totalCount) in enumerate(entries):
+            self.assertEqual(series.countDeltas[i], count - lastCount)
+            self.assertEqual(series.totalCountDeltas[i], totalCount - lastTotalCount)
+            if (count, totalCount) != (lastCount, lastTotalCount):
+                changed.append(i)
+            lastCount = count
+            lastTotalCount = totalCount
+        self.assertEqual(list(series.changed), changed)
+
+    def test_empty(self):
+        series = WcLogSeries()
+        self.assertEqual(len(series), 0)
+        self.assertEqual(list(series.rows()), [])
+        for period in PERIODS:
+            self.assertEqual(list(series.period_rows(period)), [])
+        self.assertEqual(series.range_deltas(START, START + 10), (0, 0))
+
+    def test_parse(self):
+        for seed in SEEDS:
+            wcLog = helpers.make_random_log(seed)
+            self.assert_series_equal(WcLogSeries(wcLog), helpers.get_entries(wcLog))
+
+    def test_parse_without_numpy(self):
+        with mock.patch.object(wc_log_series, '_numpy', False):
+            for seed in SEEDS:
+                wcLog = helpers.make_random_log(seed)
+                self.assert_series_equal(WcLogSeries(wcLog), helpers.get_entries(wcLog))
+
+    def test_merge(self):
+        wcLog = {'2023-01-01': ['10', '20'], '2023-01-02': ['15', '25']}
+        wcLogUpdate = {'2023-01-02': ['17', '27'], '2023-01-03': ['30', '40']}
+        series = WcLogSeries(wcLog, wcLogUpdate)
+        self.assertEqual(list(series.rows()), [
+            ('2023-01-01', 10, 10, 20, 20),
+            ('2023-01-02', 17, 7, 27, 7),
+            ('2023-01-03', 30, 13, 40, 13),
+            ])
+
+    def test_rows(self):
+        for seed in SEEDS:
+            wcLog = helpers.make_random_log(seed)
+            series = WcLogSeries(wcLog)
+            expected = helpers.get_reference_rows(wcLog)
+            self.assertEqual(list(series.rows()), expected)
+            self.assertEqual(list(series.rows(True)), expected[::-1])
+
+    def test_period_rows(self):
+        for seed in SEEDS:
+            wcLog = helpers.make_random_log(seed, days=800, density=0.3)
+            series = WcLogSeries(wcLog)
+            for period in PERIODS:
+                expected = helpers.get_reference_rows(wcLog, period)
+                self.assertEqual(list(series.period_rows(period)), expected)
+                self.assertEqual(list(series.period_rows(period, True)), expected[::-1])
+
+    def test_period_ends(self):
+        wcLog = helpers.make_random_log(5, days=800, density=0.3)
+        series = WcLogSeries(wcLog)
+        for period in PERIODS[1:]:
+            ends = list(series.period_ends(period))
+            for r in range(0, len(ends), 7):
+                # Starting at a period's end, the periods from there on are found again.
+                self.assertEqual(list(series.period_ends(period, ends[r])), ends[r + 1:])
+
+    def test_index_range(self):
+        series = WcLogSeries(helpers.make_random_log(6))
+        self.assertEqual(series.index_range(), (0, len(series)))
+        for startOrdinal in range(START - 2, START + 125, 5):
+            for endOrdinal in range(startOrdinal - 3, START + 130, 9):
+                start, end = series.index_range(startOrdinal, endOrdinal)
+                inside = [i for i, ordinal in enumerate(series.ordinals) if startOrdinal <= ordinal < endOrdinal]
+                if inside:
+                    self.assertEqual((start, end), (inside[0], inside[-1] + 1))
+                else:
+                    self.assertEqual(start, end)
+
+    def test_range_rows(self):
+        for seed in SEEDS:
+            wcLog = helpers.make_random_log(seed, days=800, density=0.3)
+            series = WcLogSeries(wcLog)
+            for startOrdinal, endOrdinal in ((START + 40, START + 400), (None, START + 100), (START + 700, None), (START + 50, START + 50)):
+                for period in PERIODS:
+                    expected = helpers.get_reference_rows(wcLog, period, startOrdinal, endOrdinal)
+                    self.assertEqual(list(series.period_rows(period, False, startOrdinal, endOrdinal)), expected)
+                    self.assertEqual(list(series.period_rows(period, True, startOrdinal, endOrdinal)), expected[::-1])
+
+    def test_range_rows_visit_only_the_range(self):
+        wcLog = helpers.make_random_log(7, days=3000, density=0.9)
+        series = WcLogSeries(wcLog)
+        with mock.patch.object(WcLogSeries, 'get_row', side_effect=series.get_row) as getRow:
+            rows = list(series.rows(True, START + 1000, START + 1010))
+        self.assertEqual(rows, helpers.get_reference_rows(wcLog, 'day', START + 1000, START + 1010)[::-1])
+        self.assertEqual(getRow.call_count, len(rows))
+
+    def test_range_deltas(self):
+        for seed in SEEDS:
+            wcLog = helpers.make_random_log(seed)
+            series = WcLogSeries(wcLog)
+            entries = helpers.get_entries(wcLog)
+            for startOrdinal in range(START - 2, START + 125, 7):
+                for endOrdinal in range(startOrdinal, START + 130, 11):
+                    before = [entry for entry in entries if entry[0] < startOrdinal]
+                    until = [entry for entry in entries if entry[0] < endOrdinal]
+                    startCounts = before[-1][1:] if before else (0, 0)
+                    endCounts = until[-1][1:] if until else (0, 0)
+                    self.assertEqual(
+                        series.range_deltas(startOrdinal, endOrdinal),
+                        (endCounts[0] - startCounts[0], endCounts[1] - startCounts[1]),
+                        )
+
+    def test_set_day(self):
+        for seed in SEEDS:
+            wcLog = helpers.make_random_log(seed, days=60)
+            series = WcLogSeries(wcLog)
+            changes = helpers.make_random_log(seed + 100, days=70, startOrdinal=START - 5, density=0.1)
+            changes[ordinal_to_iso(series.ordinals[-1])] = ['0', '0']
+            changes[ordinal_to_iso(series.ordinals[-1] + 1)] = ['5', '5']
+            for isoDate in changes:
+                count, totalCount = map(int, changes[isoDate])
+                self.assertEqual(series.set_day(isoDate, count, totalCount), wcLog.get(isoDate) != [str(count), str(totalCount)])
+                wcLog[isoDate] = [str(count), str(totalCount)]
+                self.assert_series_equal(series, helpers.get_entries(wcLog))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Unit tests for the WcStatistics class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import json
+import unittest
+from datetime import date
+import helpers
+from nvprogresslib.wc_log_series import WcLogSeries
+from nvprogresslib.wc_statistics import WcStatistics
+
+SEEDS = range(12)
+
+
+def get_series_entries(series):
+    return list(zip(series.ordinals, series.counts, series.totalCounts))
+
+
+class WcStatisticsTest(unittest.TestCase):
+
+    def assert_statistics(self, statistics, expected):
+        for key in expected:
+            if key.startswith('average'):
+                self.assertAlmostEqual(statistics[key], expected[key], msg=key)
+            else:
+                self.assertEqual(statistics[key], expected[key], msg=key)
+
+    def test_reference(self):
+        for seed in SEEDS:
+            series = WcLogSeries(helpers.make_random_log(seed, density=0.8))
+            entries = get_series_entries(series)
+            wcStatistics = WcStatistics()
+            wcStatistics.update(series)
+            for todayOrdinal in (entries[-1][0], entries[-1][0] + 1, entries[-1][0] + 2, entries[-1][0] + 40):
+                for target in (0, entries[-1][1], entries[-1][1] + 5000):
+                    self.assert_statistics(
+                        wcStatistics.get_statistics(todayOrdinal, target),
+                        helpers.get_reference_statistics(entries, todayOrdinal, target),
+                        )
+
+    def test_streaks(self):
+        wcLog = {
+            '2023-03-01': ['100', '100'],
+            '2023-03-02': ['150', '150'],
+            '2023-03-03': ['200', '200'],
+            '2023-03-04': ['190', '190'],
+            '2023-03-06': ['300', '300'],
+            '2023-03-07': ['310', '310'],
+            }
+        wcStatistics = WcStatistics()
+        wcStatistics.update(WcLogSeries(wcLog))
+        today = date(2023, 3, 8).toordinal()
+        statistics = wcStatistics.get_statistics(today)
+        self.assertEqual(statistics['longestStreak'], 2)
+        self.assertEqual(statistics['currentStreak'], 2)
+        self.assertEqual(statistics['bestDay'], '2023-03-06')
+        self.assertEqual(statistics['bestDayDelta'], 110)
+        self.assertEqual(wcStatistics.get_statistics(today + 1)['currentStreak'], 0)
+
+    def test_forecast(self):
+        wcLog = {
+            '2023-03-01': ['1000', '1000'],
+            '2023-03-30': ['1600', '1600'],
+            }
+        wcStatistics = WcStatistics()
+        wcStatistics.update(WcLogSeries(wcLog))
+        today = date(2023, 3, 30).toordinal()
+        # 600 words in 30 days make 20 words per day.
+        self.assertEqual(wcStatistics.get_statistics(today, 2000)['forecast'], '2023-04-19')
+        self.assertEqual(wcStatistics.get_statistics(today, 2001)['forecast'], '2023-04-20')
+        self.assertEqual(wcStatistics.get_statistics(today, 1600)['forecast'], '2023-03-30')
+        self.assertIsNone(wcStatistics.get_statistics(today, 0)['forecast'])
+        self.assertIsNone(wcStatistics.get_statistics(today + 31, 2000)['forecast'])
+
+    def test_incremental_update(self):
+        # Updating day by day gives the same result as updating once.
+        for seed in SEEDS:
+            wcLog = helpers.make_random_log(seed, density=0.8)
+            entries = helpers.get_entries(wcLog)
+            wcStatistics = WcStatistics()
+            series = WcLogSeries()
+            for ordinal, count, totalCount in entries:
+                series.set_day(date.fromordinal(ordinal).isoformat(), count, totalCount)
+                wcStatistics.update(series)
+            todayOrdinal = entries[-1][0]
+            self.assert_statistics(
+                wcStatistics.get_statistics(todayOrdinal, 50000),
+                helpers.get_reference_statistics(entries, todayOrdinal, 50000),
+                )
+
+    def test_changed_last_committed_day(self):
+        # A change of the last committed day makes the state rebuild from scratch.
+        wcLog = helpers.make_random_log(1, density=0.8)
+        wcStatistics = WcStatistics()
+        wcStatistics.update(WcLogSeries(wcLog))
+        isoDate = sorted(wcLog)[-2]
+        wcLog[isoDate] = ['99999', '99999']
+        series = WcLogSeries(wcLog)
+        wcStatistics.update(series)
+        entries = get_series_entries(series)
+        self.assert_statistics(
+            wcStatistics.get_statistics(entries[-1][0]),
+            helpers.get_reference_statistics(entries, entries[-1][0]),
+            )
+
+    def test_discard_from(self):
+        # A change of an earlier day discards the state.
+        wcLog = helpers.make_random_log(3, density=0.8)
+        series = WcLogSeries(wcLog)
+        wcStatistics = WcStatistics()
+        wcStatistics.update(series)
+        wcStatistics.discard_from(series.ordinals[-1])
+        self.assertNotEqual(wcStatistics.get_state(), WcStatistics().get_state())
+        isoDate = sorted(wcLog)[1]
+        series.set_day(isoDate, 99999, 99999)
+        wcStatistics.discard_from(series.ordinals[1])
+        self.assertEqual(wcStatistics.get_state(), WcStatistics().get_state())
+        wcStatistics.update(series)
+        entries = get_series_entries(series)
+        self.assert_statistics(
+            wcStatistics.get_statistics(entries[-1][0]),
+            helpers.get_reference_statistics(entries, entries[-1][0]),
+            )
+
+    def test_state(self):
+        series = WcLogSeries(helpers.make_random_log(2, density=0.8))
+        wcStatistics = WcStatistics()
+        wcStatistics.update(series)
+        restored = WcStatistics()
+        restored.set_state(json.loads(json.dumps(wcStatistics.get_state())))
+        restored.update(series)
+        todayOrdinal = series.ordinals[-1]
+        self.assertEqual(restored.get_statistics(todayOrdinal, 90000), wcStatistics.get_statistics(todayOrdinal, 90000))
+
+    def test_invalid_state(self):
+        wcStatistics = WcStatistics()
+        wcStatistics.set_state(dict(days=3))
+        self.assertEqual(wcStatistics.get_state(), WcStatistics().get_state())
+
+    def test_empty(self):
+        wcStatistics = WcStatistics()
+        wcStatistics.update(WcLogSeries())
+        statistics = wcStatistics.get_statistics(date(2023, 1, 1).toordinal(), 100)
+        self.assertEqual(statistics['count'], 0)
+        self.assertEqual(statistics['currentStreak'], 0)
+        self.assertIsNone(statistics['bestDay'])
+        self.assertIsNone(statistics['forecast'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Unit tests for the WordCounter class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import random
+import unittest
+import helpers
+from nvprogresslib.word_counter import WordCounter
+
+WORDS = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit')
+
+
+def make_random_novel(seed, chapters=8, scenes=6):
+    """Return a novel with random scene contents, scene types, and a trash chapter."""
+    rnd = random.Random(seed)
+    novel = helpers.Novel()
+    scId = 0
+    for chId in range(1, chapters + 1):
+        for i in range(scenes):
+            scId += 1
+            text = ' '.join(rnd.choice(WORDS) for j in range(rnd.randint(0, 30)))
+            novel.add_scene(str(chId), str(scId), text, rnd.choice((0, 0, 0, 1, 2, 3)))
+    novel.chapters[str(chapters)].isTrash = True
+    return novel
+
+
+def get_reference_count(novel):
+    """Return (count, totalCount), counting each scene's words from scratch."""
+    count = 0
+    totalCount = 0
+    for chId in novel.srtChapters:
+        if novel.chapters[chId].isTrash:
+            continue
+
+        for scId in novel.chapters[chId].srtScenes:
+            scene = novel.scenes[scId]
+            if scene.scType == 0:
+                count += len(scene.sceneContent.split())
+                totalCount += len(scene.sceneContent.split())
+            elif scene.scType == 1:
+                totalCount += len(scene.sceneContent.split())
+    return count, totalCount
+
+
+class WordCounterTest(unittest.TestCase):
+
+    def test_count(self):
+        for seed in range(10):
+            novel = make_random_novel(seed)
+            wordCounter = WordCounter()
+            self.assertEqual(wordCounter.count(novel), get_reference_count(novel))
+            self.assertEqual(wordCounter.hits, 0)
+            misses = wordCounter.misses
+            self.assertEqual(wordCounter.count(novel), get_reference_count(novel))
+            self.assertEqual(wordCounter.hits, misses)
+            self.assertEqual(wordCounter.misses, misses)
+
+    def test_changes(self):
+        novel = make_random_novel(1)
+        novel.scenes['2'].scType = 0
+        wordCounter = WordCounter()
+        wordCounter.count(novel)
+        misses = wordCounter.misses
+
+        novel.scenes['2'].sceneContent = 'a new text'
+        novel.chapters['1'].srtScenes.remove('3')
+        self.assertEqual(wordCounter.count(novel), get_reference_count(novel))
+        self.assertEqual(wordCounter.misses, misses + 1)
+        self.assertEqual(wordCounter.sceneCounts['2'], 3)
+        self.assertNotIn('3', wordCounter.sceneCounts)
+
+        # An edit keeping the number of words is recognized by the letter count.
+        novel.scenes['2'].sceneContent = 'a newer text'
+        wordCounter.count(novel)
+        self.assertEqual(wordCounter.misses, misses + 2)
+
+    def test_dump_and_load(self):
+        novel = make_random_novel(2)
+        wordCounter = WordCounter()
+        wordCounter.count(novel)
+        sceneCounts = wordCounter.dump()
+        self.assertEqual(len(sceneCounts), wordCounter.misses)
+
+        novel.scenes['1'].sceneContent = 'changed since the dump'
+        restored = WordCounter()
+        restored.load(sceneCounts)
+        self.assertEqual(restored.count(novel), get_reference_count(novel))
+        # Only the scene changed since the dump is a miss.
+        self.assertEqual(restored.misses, 1)
+
+        # A filled cache is more recent, so it is kept.
+        restored.load({})
+        self.assertEqual(restored.dump(), dict(wordCounter.dump(), **{'1': (4, 19)}))
+
+    def test_clear(self):
+        novel = make_random_novel(4)
+        wordCounter = WordCounter()
+        wordCounter.count(novel)
+        wordCounter.clear()
+        self.assertEqual((wordCounter.hits, wordCounter.misses), (0, 0))
+        self.assertEqual(wordCounter.sceneCounts, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+"""Benchmark the progress viewer and the exporters with synthetic logs.
+
+Usage:
+benchmark_progress.py [--days N [N ...]] [--scenes N] [--words N] [--repeat N] [--tk] [--output FILE]
+
+Time ProgressViewer.build_tree (opening and refreshing), ProgressViewer.reset_tree,
+HtmlWcLog._get_text and the exporters' write methods, and Configuration.read and Configuration.write
+for synthetic logs and a synthetic novel.
+
+By default, tkinter is replaced by headless stand-ins.
+With --tk, the real tkinter is used, e.g. under "xvfb-run".
+
+The results are written as JSON, one object per measurement, so they can be
+compared between releases.
+
+The PyWriter project (see https://github.com/peter88213/PyWriter)
+must be located on the same directory level as the novelyst_progress project.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+from concurrent import futures
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+sys.path.insert(0, f'{os.getcwd()}/../../PyWriter/src')
+import headless_ui
+
+DAYS = (1000, 10000, 100000, 1000000)
+SETTINGS = dict(
+    window_geometry='510x440',
+    date_width=100,
+    wordcount_width=100,
+    wordcount_delta_width=100,
+    totalcount_width=100,
+    totalcount_delta_width=100,
+    period='day',
+    word_target=0,
+    show_timings=False,
+    log_timings=False,
+    auto_refresh=False,
+)
+
+
+def measure(func, repeat):
+    """Return a dictionary with the min and median durations of repeated calls in seconds."""
+    durations = []
+    for __ in range(repeat):
+        startTime = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - startTime)
+    return dict(min=min(durations), median=statistics.median(durations), repeat=repeat)
+
+
+class Benchmark:
+    """Benchmark runner collecting the results."""
+
+    def __init__(self, tempDir, repeat, useTk):
+        self.tempDir = tempDir
+        self.repeat = repeat
+        self.useTk = useTk
+        self.results = []
+        self._root = None
+        if useTk:
+            import tkinter as tk
+            self._root = tk.Tk()
+            self._root.withdraw()
+
+    def record(self, operation, days, scenes, func, repeat=None):
+        if repeat is None:
+            repeat = self.repeat
+        result = dict(operation=operation, days=days, scenes=scenes)
+        result.update(measure(func, repeat))
+        self.results.append(result)
+        print(f'{operation:28} days={days:<8} scenes={scenes:<6} min={result["min"]:.4f} s', file=sys.stderr)
+
+    def run_pending(self, viewer):
+        """Process the pending after() callbacks until the background word count is done."""
+        if self.useTk:
+            while viewer._countFuture is not None:
+                self._root.update()
+        else:
+
+            def wait_for_count():
+                if viewer._countFuture is not None:
+                    futures.wait([viewer._countFuture])
+
+            viewer.run_pending(wait_for_count)
+
+    def run_viewer(self, days, scenes, wordsPerScene):
+        from nvprogresslib.progress_viewer import ProgressViewer
+        from nvprogresslib.progress_index import ProgressIndex
+        novel = headless_ui.make_novel(scenes, wordsPerScene)
+        prjFile = headless_ui.PrjFile(os.path.join(self.tempDir, f'bench_{days}.yw7'), novel, headless_ui.make_wc_log(days))
+        ui = headless_ui.Ui(prjFile)
+        viewers = []
+
+        def open_viewer():
+            # Discard the index, so that every opening is a cold start.
+            index = ProgressIndex(prjFile.filePath)
+            if os.path.isfile(index.filePath):
+                os.remove(index.filePath)
+            plugin = headless_ui.Plugin(SETTINGS)
+            viewer = ProgressViewer(plugin, ui)
+            self.run_pending(viewer)
+            viewers.append(viewer)
+
+        self.record('ProgressViewer.__init__', days, scenes, open_viewer, repeat=1)
+        viewer = viewers[-1]
+
+        def refresh():
+            viewer.build_tree()
+            self.run_pending(viewer)
+
+        self.record('build_tree (refresh)', days, scenes, refresh)
+
+        def modify_and_refresh():
+            scene = novel.scenes[novel.chapters[novel.srtChapters[0]].srtScenes[0]]
+            scene.sceneContent = f'{scene.sceneContent} more'
+            refresh()
+
+        self.record('build_tree (modified)', days, scenes, modify_and_refresh)
+
+        def reset():
+            viewer.reset_tree()
+            viewer.build_tree()
+            self.run_pending(viewer)
+
+        self.record('reset_tree + build_tree', days, scenes, reset)
+        for viewer in viewers:
+            viewer.on_quit()
+
+    def run_export(self, days):
+        from nvprogresslib.csv_wc_log import CsvWcLog
+        from nvprogresslib.html_wc_log import HtmlWcLog
+        from nvprogresslib.jsonl_wc_log import JsonlWcLog
+        from nvprogresslib.ods_wc_log import OdsWcLog
+        from nvprogresslib.wc_log_series import WcLogSeries
+        wcLog = headless_ui.make_wc_log(days)
+        self.record('WcLogSeries.__init__', days, 0, lambda: WcLogSeries(wcLog))
+        report = HtmlWcLog(os.path.join(self.tempDir, f'bench{HtmlWcLog.SUFFIX}{HtmlWcLog.EXTENSION}'))
+        report.novel = headless_ui.Novel()
+        report.wcLogSeries = WcLogSeries(wcLog)
+        self.record('HtmlWcLog._get_text', days, 0, report._get_text)
+        self.record('HtmlWcLog.write', days, 0, report.write)
+        for exportClass in (CsvWcLog, JsonlWcLog, OdsWcLog):
+            report = exportClass(os.path.join(self.tempDir, f'bench{exportClass.SUFFIX}{exportClass.EXTENSION}'))
+            report.wcLogSeries = WcLogSeries(wcLog)
+            self.record(f'{exportClass.__name__}.write', days, 0, report.write)
+
+    def run_configuration(self):
+        from pywriter.config.configuration import Configuration
+        iniFile = os.path.join(self.tempDir, 'progress.ini')
+        configuration = Configuration(SETTINGS, {})
+        self.record('Configuration.write', 0, 0, lambda: configuration.write(iniFile))
+        self.record('Configuration.read', 0, 0, lambda: configuration.read(iniFile))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the progress viewer and the exporters.')
+    parser.add_argument('--days', type=int, nargs='+', default=DAYS, help='log lengths in days')
+    parser.add_argument('--scenes', type=int, default=500, help='number of scenes of the synthetic novel')
+    parser.add_argument('--words', type=int, default=800, help='number of words per scene')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repetitions per measurement')
+    parser.add_argument('--tk', action='store_true', help='use the real tkinter (requires a display)')
+    parser.add_argument('--output', default=None, help='JSON output file (default: stdout)')
+    args = parser.parse_args()
+    if not args.tk:
+        headless_ui.install_fake_tk()
+    with tempfile.TemporaryDirectory() as tempDir:
+        benchmark = Benchmark(tempDir, args.repeat, args.tk)
+        benchmark.run_configuration()
+        for days in args.days:
+            benchmark.run_export(days)
+            benchmark.run_viewer(days, args.scenes, args.words)
+    report = dict(
+        python=platform.python_version(),
+        platform=platform.platform(),
+        tk=args.tk,
+        results=benchmark.results,
+        )
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+"""Provide headless stand-ins for tkinter and the novelyst objects used by the plugin.
+
+The stand-ins make the progress viewer and the exporters runnable without
+a display and without a novelyst installation, e.g. for benchmarking.
+Call install_fake_tk() before importing any nvprogresslib module that uses tkinter.
+If a display is available (e.g. under Xvfb), the real tkinter can be used instead.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import sys
+import types
+from datetime import date
+
+
+class FakeWidget:
+    """Generic widget stand-in accepting any method call."""
+
+    def __init__(self, master=None, **kwargs):
+        self.master = master
+        self._options = dict(kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def no_op(*args, **kwargs):
+            return None
+
+        return no_op
+
+    def configure(self, **kwargs):
+        self._options.update(kwargs)
+
+    config = configure
+
+    def cget(self, option):
+        return self._options.get(option)
+
+    def winfo_width(self):
+        return self._options.get('width', 600)
+
+    def winfo_height(self):
+        return self._options.get('height', 400)
+
+
+class FakeToplevel(FakeWidget):
+    """Toplevel stand-in with a simple event queue for after() callbacks."""
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._scheduled = []
+
+    def after(self, ms, func=None, *args):
+        self._scheduled.append((func, args))
+        return f'after#{len(self._scheduled)}'
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, afterId):
+        pass
+
+    def winfo_geometry(self):
+        return '510x440+0+0'
+
+    def run_pending(self, wait=None):
+        """Run the scheduled callbacks, including the ones they schedule. Return the number of calls.
+
+        Optional arguments:
+            wait -- function called before each callback, e.g. to wait for a background task
+                    instead of polling it in a busy loop.
+        """
+        calls = 0
+        while self._scheduled:
+            if wait is not None:
+                wait()
+            func, args = self._scheduled.pop(0)
+            func(*args)
+            calls += 1
+        return calls
+
+
+class FakeTreeview(FakeWidget):
+    """Treeview stand-in keeping the item hierarchy, values, and tags."""
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._children = {'': []}
+        self._items = {}
+        self._columns = {}
+        self.calls = 0
+
+    def insert(self, parent, index, iid=None, **kwargs):
+        self.calls += 1
+        if index == 'end':
+            index = len(self._children[parent])
+        self._children[parent].insert(int(index), iid)
+        self._children[iid] = []
+        self._items[iid] = dict(kwargs, parent=parent)
+        return iid
+
+    def item(self, iid, option=None, **kwargs):
+        self.calls += 1
+        if kwargs:
+            self._items[iid].update(kwargs)
+            return None
+
+        if option is not None:
+            return self._items[iid].get(option)
+
+        return dict(self._items[iid])
+
+    def set(self, iid, column=None, value=None):
+        self.calls += 1
+        return ''
+
+    def delete(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            if iid not in self._items:
+                continue
+
+            self.delete(*self._children[iid])
+            self._children[self._items[iid]['parent']].remove(iid)
+            del self._children[iid]
+            del self._items[iid]
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+        self._children[self._items[iid]['parent']].remove(iid)
+        self._children[parent].insert(int(index), iid)
+        self._items[iid]['parent'] = parent
+
+    def set_children(self, parent, *iids):
+        self.calls += 1
+        self._children[parent] = list(iids)
+
+    def get_children(self, parent=''):
+        return tuple(self._children.get(parent, ()))
+
+    def exists(self, iid):
+        return iid in self._items
+
+    def parent(self, iid):
+        return self._items[iid]['parent']
+
+    def index(self, iid):
+        return self._children[self._items[iid]['parent']].index(iid)
+
+    def column(self, column, option=None, **kwargs):
+        settings = self._columns.setdefault(column, {'width': 100})
+        settings.update(kwargs)
+        if option is not None:
+            return settings.get(option)
+
+        return None
+
+
+class FakeCombobox(FakeWidget):
+    """Combobox stand-in with a selectable index."""
+
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self._current = 0
+
+    def current(self, newIndex=None):
+        if newIndex is None:
+            return self._current
+
+        self._current = newIndex
+
+    def get(self):
+        values = self._options.get('values', ())
+        if values:
+            return values[self._current]
+
+        return ''
+
+
+class FakeVariable:
+    """Variable stand-in, e.g. for StringVar."""
+
+    def __init__(self, master=None, value=None, name=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def trace_add(self, mode, callback):
+        return None
+
+
+def install_fake_tk():
+    """Replace tkinter and tkinter.ttk by headless stand-ins in sys.modules."""
+    tk = types.ModuleType('tkinter')
+    ttk = types.ModuleType('tkinter.ttk')
+    for name in ('Tk', 'Frame', 'Label', 'Button', 'Entry', 'Canvas', 'Menu', 'Checkbutton', 'Radiobutton', 'Spinbox'):
+        setattr(tk, name, type(name, (FakeWidget,), {}))
+        setattr(ttk, name, type(name, (FakeWidget,), {}))
+    tk.Toplevel = FakeToplevel
+    tk.StringVar = FakeVariable
+    tk.IntVar = FakeVariable
+    tk.BooleanVar = FakeVariable
+    tk.TclError = type('TclError', (Exception,), {})
+    tk.END = 'end'
+    tk.ttk = ttk
+    ttk.Treeview = FakeTreeview
+    ttk.Combobox = FakeCombobox
+    ttk.Scrollbar = type('Scrollbar', (FakeWidget,), {})
+    ttk.Notebook = type('Notebook', (FakeWidget,), {})
+    ttk.Labelframe = type('Labelframe', (FakeWidget,), {})
+    ttk.LabelFrame = ttk.Labelframe
+    sys.modules['tkinter'] = tk
+    sys.modules['tkinter.ttk'] = ttk
+
+
+#--- novelyst stand-ins.
+
+WORDS = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit')
+
+
+class Scene:
+    """Scene stand-in, counting words and letters when the content is set, as the novel model does."""
+
+    def __init__(self, sceneContent='', scType=0):
+        self.sceneContent = sceneContent
+        self.scType = scType
+        self.title = ''
+
+    @property
+    def sceneContent(self):
+        return self._sceneContent
+
+    @sceneContent.setter
+    def sceneContent(self, text):
+        self._sceneContent = text
+        words = text.split()
+        self.wordCount = len(words)
+        self.letterCount = sum(map(len, words))
+
+
+class Chapter:
+    """Chapter stand-in."""
+
+    def __init__(self, title=''):
+        self.title = title
+        self.srtScenes = []
+        self.isTrash = False
+        self.chType = 0
+
+
+class Novel:
+    """Novel stand-in."""
+
+    def __init__(self):
+        self.title = 'Synthetic novel'
+        self.authorName = 'Benchmark'
+        self.chapters = {}
+        self.srtChapters = []
+        self.scenes = {}
+
+
+def make_text(words, seed=0):
+    """Return a text made of a given number of words."""
+    return ' '.join(WORDS[(seed + i) % len(WORDS)] for i in range(words))
+
+
+def make_novel(scenes=100, wordsPerScene=1000, scenesPerChapter=10):
+    """Return a synthetic Novel stand-in."""
+    novel = Novel()
+    chId = None
+    for i in range(scenes):
+        if i % scenesPerChapter == 0:
+            chId = str(len(novel.chapters) + 1)
+            novel.chapters[chId] = Chapter(f'Chapter {chId}')
+            novel.srtChapters.append(chId)
+        scId = str(i + 1)
+        novel.scenes[scId] = Scene(make_text(wordsPerScene, i))
+        novel.chapters[chId].srtScenes.append(scId)
+    return novel
+
+
+def make_wc_log(days, startCount=0, endOrdinal=None):
+    """Return a synthetic word count log spanning a number of days up to a given day.
+
+    Every third day is logged unchanged, so that the log contains entries
+    to be skipped, as real logs do.
+    """
+    if endOrdinal is None:
+        endOrdinal = date.today().toordinal() - 1
+    startOrdinal = max(1, endOrdinal - days + 1)
+    wcLog = {}
+    count = startCount
+    for i, ordinal in enumerate(range(startOrdinal, startOrdinal + days)):
+        if i % 3:
+            count += (i * 7919) % 1500 - 250
+            count = max(count, 0)
+        wcLog[date.fromordinal(ordinal).isoformat()] = [str(count), str(count + 1000)]
+    return wcLog
+
+
+class PrjFile:
+    """Project file stand-in."""
+
+    def __init__(self, filePath, novel, wcLog):
+        self.filePath = filePath
+        self.novel = novel
+        self.wcLog = wcLog
+        self.wcLogUpdate = {}
+        if not os.path.isfile(filePath):
+            with open(filePath, 'w', encoding='utf-8') as f:
+                f.write('<YWRITER7/>\n')
+
+
+class Ui:
+    """NovelystTk stand-in."""
+
+    def __init__(self, prjFile):
+        self.prjFile = prjFile
+        self.novel = prjFile.novel
+        self.toolsMenu = FakeWidget()
+        self.isModified = False
+
+
+class Plugin:
+    """Plugin stand-in providing the settings and the word counter."""
+
+    def __init__(self, settings):
+        from nvprogresslib.word_counter import WordCounter
+        self.kwargs = dict(settings)
+        self.wordCounter = WordCounter()
@@ -0,0 +1,154 @@
+"""Measure the startup cost of the novelyst_progress plugin.
+
+Usage:
+measure_startup.py [--runs N] [--importtime]
+
+Each run starts a fresh Python process with headless stand-ins for tkinter and novelyst, and measures
+- importing the plugin module,
+- importing the plugin module with the modules novelyst has already loaded (HOST_MODULES),
+- Plugin.install(), as called at novelyst startup,
+- loading the configuration, which install() defers to the first menu click,
+- the first menu click, i.e. starting the viewer,
+- importing the modules deferred to first use (DEFERRED_MODULES).
+
+The "eager install" line shows the cost install() would have when loading
+the configuration at startup, so the saving of the lazy loading is install() vs. eager install.
+The "deferred" line shows the import cost no longer paid at startup.
+With --importtime, Python's own import time breakdown of the plugin module is printed as well.
+
+The PyWriter project (see https://github.com/peter88213/PyWriter)
+must be located on the same directory level as the novelyst_progress project.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst_progress
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+TOOLS_PATH = os.path.dirname(os.path.abspath(__file__))
+SRC_PATH = f'{TOOLS_PATH}/../src'
+PYWRITER_PATH = f'{os.getcwd()}/../../PyWriter/src'
+
+HOST_MODULES = (
+    'gettext',
+    'locale',
+    'pathlib',
+    'webbrowser',
+    'datetime',
+    'tempfile',
+    'string',
+    'urllib.parse',
+    'pywriter.pywriter_globals',
+    'pywriter.config.configuration',
+    'pywriter.ui.set_icon_tk',
+    )
+# Modules imported by novelyst before the plugins are loaded.
+
+DEFERRED_MODULES = (
+    'concurrent.futures',
+    'logging.handlers',
+    )
+# Modules the plugin imports not before they are needed.
+
+RUN_SCRIPT = '''
+import json
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, {srcPath!r})
+sys.path.insert(0, {pywriterPath!r})
+sys.path.insert(0, {toolsPath!r})
+import importlib
+import headless_ui
+headless_ui.install_fake_tk()
+results = {{}}
+if {preload!r}:
+    for moduleName in {hostModules!r}:
+        try:
+            importlib.import_module(moduleName)
+        except ImportError:
+            pass
+    importName = 'import (host preloaded)'
+else:
+    importName = 'import'
+startTime = time.perf_counter()
+import novelyst_progress
+results[importName] = time.perf_counter() - startTime
+
+tempDir = tempfile.mkdtemp()
+prjFile = headless_ui.PrjFile(os.path.join(tempDir, 'startup.yw7'), headless_ui.make_novel(10, 100), headless_ui.make_wc_log(100))
+ui = headless_ui.Ui(prjFile)
+plugin = novelyst_progress.Plugin()
+startTime = time.perf_counter()
+plugin.install(ui)
+results['install'] = time.perf_counter() - startTime
+
+startTime = time.perf_counter()
+plugin._load_configuration()
+results['configuration'] = time.perf_counter() - startTime
+results['eager install'] = results['install'] + results['configuration']
+
+startTime = time.perf_counter()
+plugin._start_viewer()
+results['first click'] = time.perf_counter() - startTime
+
+startTime = time.perf_counter()
+for moduleName in {deferredModules!r}:
+    importlib.import_module(moduleName)
+results['deferred'] = time.perf_counter() - startTime
+print(json.dumps(results))
+'''
+
+
+def run_once(preload=False):
+    """Return a dictionary of durations measured in a fresh Python process.
+
+    Optional arguments:
+        preload: bool -- if True, import the HOST_MODULES before the plugin module.
+    """
+    script = RUN_SCRIPT.format(
+        srcPath=SRC_PATH,
+        pywriterPath=PYWRITER_PATH,
+        toolsPath=TOOLS_PATH,
+        preload=preload,
+        hostModules=HOST_MODULES,
+        deferredModules=DEFERRED_MODULES,
+        )
+    output = subprocess.run([sys.executable, '-c', script], check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def show_import_time():
+    """Print Python's import time breakdown of the plugin module."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join((SRC_PATH, PYWRITER_PATH, env.get('PYTHONPATH', '')))
+    subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import novelyst_progress'], env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the startup cost of the novelyst_progress plugin.')
+    parser.add_argument('--runs', type=int, default=5, help='number of fresh processes to measure')
+    parser.add_argument('--importtime', action='store_true', help="print Python's import time breakdown")
+    args = parser.parse_args()
+    samples = [run_once() for __ in range(args.runs)]
+    preloadedSamples = [run_once(preload=True) for __ in range(args.runs)]
+    names = list(samples[0])
+    names.insert(1, 'import (host preloaded)')
+    for name in names:
+        if name in samples[0]:
+            durations = [sample[name] * 1000 for sample in samples]
+        else:
+            durations = [sample[name] * 1000 for sample in preloadedSamples]
+        print(f'{name:24} median {statistics.median(durations):8.3f} ms   min {min(durations):8.3f} ms')
+    if args.importtime:
+        show_import_time()
+
+
+if __name__ == '__main__':
+    main()